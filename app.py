@@ -2,9 +2,9 @@ from flask import Flask, request, render_template_string, session
 import os
 import PyPDF2
 import re
-import requests
 import pandas as pd
-from bs4 import BeautifulSoup
+
+from scrapers import fetch_internships
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'
@@ -18,28 +18,6 @@ def load_job_listings():
     df = pd.read_csv('./job_listings.csv')  # Adjust the path to your CSV file
     return df
 
-# Fetch internships
-def fetch_internships(query):
-    url = f"https://internshala.com/internships/keywords-{query.replace(' ', '-')}"
-    try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        internships = []
-        listings = soup.find_all('div', class_='internship_meta')
-        for listing in listings[:10]:
-            try:
-                title = listing.find('h3').get_text(strip=True)
-                company_tag = listing.find('a', class_='link_display_like_text')
-                company = company_tag.get_text(strip=True) if company_tag else "N/A"
-                link = "https://internshala.com" + listing.find('a')['href']
-                internships.append({'title': title, 'company': company, 'link': link})
-            except AttributeError:
-                continue
-        return internships
-    except Exception as e:
-        print(f"Error fetching internships: {e}")
-        return []
-
 # Extract skills from resume
 def parse_resume(file):
     skills = set()
@@ -0,0 +1,42 @@
+"""Batch scoring (lookup_batch) against one lookup per skill set, for each ranking engine.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch --rows 100000 1000000 --skill-sets 5000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_jobs, make_resumes
+from ranking import SparseRanker, TfidfRanker
+
+
+def seconds(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(rows, count):
+    jobs = make_jobs(rows)
+    skill_sets = make_resumes(count)
+    binary = SparseRanker.from_jobs(jobs)
+    for name, engine in [('ranked', binary), ('tfidf', TfidfRanker.from_binary(binary))]:
+        engine.lookup_batch(skill_sets[:1])  # Build the skill x job transpose outside the timing
+        looped, looped_seconds = seconds(lambda: [engine.lookup(skills) for skills in skill_sets])
+        batched, batch_seconds = seconds(lambda: engine.lookup_batch(skill_sets))
+        assert batched == looped
+        print(f'{rows:>9} rows  {count} skill sets  {name:<6}  one by one {looped_seconds:7.2f} s  '
+              f'batch {batch_seconds:7.2f} s  speedup {looped_seconds / batch_seconds:5.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--skill-sets', type=int, default=5000)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.skill_sets)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Peak RSS and throughput of loading a catalog CSV with pandas versus the streaming compiler.
+
+Each measurement runs in a fresh interpreter so ru_maxrss belongs to that loader alone.
+Run from the repository root:
+    python -m benchmarks.bench_catalog_load --sizes 100000 1000000 3000000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_jobs_csv
+
+
+def load_pandas(path, workdir):
+    import pandas as pd
+    from ranking import SparseRanker
+    from skill_index import SkillIndex
+    jobs = pd.read_csv(path)
+    return SkillIndex.from_jobs(jobs), SparseRanker.from_jobs(jobs)
+
+
+def load_stream(path, workdir):
+    from compiled_catalog import CompiledCatalog, compile_catalog
+    catalog = CompiledCatalog(compile_catalog(path, os.path.join(workdir, 'catalog.jobcat')))
+    return catalog.skill_index(), catalog.sparse_ranker()
+
+
+def load_nothing(path, workdir):
+    # Interpreter plus numpy/pandas/scipy imports, for reference
+    import compiled_catalog  # noqa: F401
+
+
+LOADERS = {'imports': load_nothing, 'pandas': load_pandas, 'stream': load_stream}
+
+
+def child(loader, path, workdir):
+    started = time.perf_counter()
+    LOADERS[loader](path, workdir)
+    seconds = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': seconds, 'peak_mb': peak_kb / 1024}))
+
+
+def measure(loader, path, workdir):
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_catalog_load', '--child', loader, path, workdir],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 3_000_000])
+    parser.add_argument('--loaders', nargs='+', default=list(LOADERS), choices=list(LOADERS))
+    parser.add_argument('--child', nargs=3, metavar=('LOADER', 'CSV', 'WORKDIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'jobs.csv')
+        for rows in args.sizes:
+            write_jobs_csv(path, rows)
+            size_mb = os.path.getsize(path) / 2 ** 20
+            for loader in args.loaders:
+                result = measure(loader, path, workdir)
+                print(f'{rows:>9} rows ({size_mb:7.1f} MB)  {loader:<7}  peak RSS {result["peak_mb"]:8.1f} MB  '
+                      f'{result["seconds"]:7.2f} s  {rows / max(result["seconds"], 1e-9):>10,.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
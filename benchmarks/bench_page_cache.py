@@ -0,0 +1,49 @@
+"""Re-upload latency of an edited resume with and without the page text cache.
+
+Each round parses a resume, then a version of it with one more skill mentioned (so
+one page changes), and reports how long the edited version took.
+
+Run from the repository root:
+    python -m benchmarks.bench_page_cache --pages 2 10 20 --rounds 20
+"""
+import argparse
+import time
+
+import text_extractors
+from benchmarks.synthetic import make_resume_pdf
+from parse_cache import PageTextCache
+from resume_parser import ExtractionBudget, extract_skills
+from text_extractors import backend_names
+
+
+def edited_seconds(pages, rounds, backend, cached):
+    # A fresh in-memory cache per run: nothing carried over from earlier runs or from RESUME_PAGE_CACHE_DIR
+    text_extractors.page_text_cache = PageTextCache('bench', entries=10 ** 6 if cached else 0, directory='')
+    budget = dict(max_pages=10 ** 6, max_chars=10 ** 12, max_seconds=10 ** 6)
+    seconds = 0.0
+    for seed in range(rounds):
+        original = make_resume_pdf(['Python', 'SQL'], pages=pages, seed=seed, compress=True)
+        edited = make_resume_pdf(['Python', 'SQL', 'Docker'], pages=pages, seed=seed, compress=True)
+        extract_skills(original, ExtractionBudget(**budget), pdf_backend=backend)
+        started = time.perf_counter()
+        skills, _ = extract_skills(edited, ExtractionBudget(**budget), pdf_backend=backend)
+        seconds += time.perf_counter() - started
+        assert skills['Docker'] == 1
+    return seconds / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[2, 10, 20])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    for backend in backend_names():
+        for pages in args.pages:
+            uncached = edited_seconds(pages, args.rounds, backend, cached=False)
+            cached = edited_seconds(pages, args.rounds, backend, cached=True)
+            print(f'{backend:<8} {pages:3d} pages  uncached {uncached * 1e3:8.2f} ms  '
+                  f'page cache {cached * 1e3:8.2f} ms  ({uncached / cached:5.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Per-query latency of the suggestion engines against the original iterrows scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_ranking --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+from benchmarks.bench_skill_index import legacy_suggestions
+from benchmarks.synthetic import make_jobs, make_resumes
+from ranking import SUGGESTION_ENGINES
+
+
+class _Snapshot:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def derive(self, name, factory):
+        return factory(self)
+
+
+def per_query(fn, queries):
+    started = time.perf_counter()
+    for skills in queries:
+        fn(skills)
+    return (time.perf_counter() - started) / len(queries)
+
+
+def run(rows, queries, legacy_queries):
+    jobs = make_jobs(rows)
+    resumes = make_resumes(queries)
+    line = [f'{rows:>9} rows']
+    if legacy_queries:
+        seconds = per_query(lambda skills: legacy_suggestions(jobs, skills), resumes[:legacy_queries])
+        line.append(f'iterrows {seconds * 1e3:9.2f} ms')
+    for mode, (_, build) in SUGGESTION_ENGINES.items():
+        started = time.perf_counter()
+        engine = build(_Snapshot(jobs))
+        build_seconds = time.perf_counter() - started
+        seconds = per_query(engine.lookup, resumes)
+        line.append(f'{mode} {seconds * 1e3:8.3f} ms (build {build_seconds:6.2f} s)')
+    print('  '.join(line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=200, help='engine lookups timed per size')
+    parser.add_argument('--legacy-queries', type=int, default=1, help='iterrows scans timed per size (0 to skip)')
+    args = parser.parse_args()
+    for rows in args.sizes:
+        run(rows, args.queries, args.legacy_queries)
+
+
+if __name__ == '__main__':
+    main()
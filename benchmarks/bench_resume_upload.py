@@ -0,0 +1,70 @@
+"""Parse resume uploads from the request stream against saving them to uploads/ and reopening them.
+
+Run from the repository root:
+    python -m benchmarks.bench_resume_upload --pages 1 5 20 --uploads 200 --dir uploads
+"""
+import argparse
+import io
+import os
+import time
+
+from werkzeug.datastructures import FileStorage
+
+import text_extractors
+from benchmarks.synthetic import make_resume_pdf
+from parse_cache import PageTextCache
+from resume_parser import guarded_extract, read_bytes
+
+# Every upload is really parsed: the app's parser pool would answer all but the first from
+# its content-keyed cache (and job table), and the page text cache would serve the pages
+text_extractors.page_text_cache = PageTextCache('bench', entries=0, directory='')
+
+
+# What the parser pool runs for an upload, in this thread and without its caches
+def parse_resume(file):
+    return guarded_extract(read_bytes(file), max_cpu=0)[0]
+
+
+# The /details body the in-memory path replaced
+def legacy_details(resume_file, directory):
+    resume_path = os.path.join(directory, resume_file.filename)
+    resume_file.save(resume_path)
+    skills = parse_resume(resume_path)
+    os.remove(resume_path)
+    return skills
+
+
+def in_memory_details(resume_file, directory):
+    return parse_resume(resume_file.stream)
+
+
+def per_upload(details, pdf, uploads, directory):
+    started = time.perf_counter()
+    for _ in range(uploads):
+        upload = FileStorage(io.BytesIO(pdf), filename='resume.pdf')
+        skills = details(upload, directory)
+    return skills, (time.perf_counter() - started) / uploads
+
+
+def run(pages, uploads, directory):
+    pdf = make_resume_pdf(['Python', 'JavaScript', 'Machine Learning', 'SQL'], pages=pages)
+    legacy, legacy_seconds = per_upload(legacy_details, pdf, uploads, directory)
+    in_memory, memory_seconds = per_upload(in_memory_details, pdf, uploads, directory)
+    assert in_memory == legacy
+    print(f'{pages:>4} pages  {len(pdf) / 1024:8.1f} KiB  save+reopen {legacy_seconds * 1e3:8.2f} ms/upload  '
+          f'in memory {memory_seconds * 1e3:8.2f} ms/upload  saved {(legacy_seconds - memory_seconds) * 1e3:6.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--uploads', type=int, default=200)
+    parser.add_argument('--dir', default='uploads', help='where the legacy path writes uploads')
+    args = parser.parse_args()
+    os.makedirs(args.dir, exist_ok=True)
+    for pages in args.pages:
+        run(pages, args.uploads, args.dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Aho-Corasick SkillExtractor against one regex alternation of every taxonomy spelling.
+
+Run from the repository root:
+    python -m benchmarks.bench_skill_extractor --patterns 10 1000 10000 --words 1500
+"""
+import argparse
+import random
+import re
+import time
+from collections import Counter
+
+from benchmarks.synthetic import make_resume_text, make_taxonomy
+from skill_extractor import SkillExtractor
+
+
+def regex_extractor(taxonomy):
+    canonical = {}
+    for name, aliases in taxonomy:
+        for spelling in [name, *aliases]:
+            canonical[spelling.lower()] = name
+    # Longest first, so the alternation prefers "Data Mining" over "Data" like the automaton does
+    spellings = sorted(canonical, key=len, reverse=True)
+    pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, spellings)) + r')\b', re.IGNORECASE)
+    return lambda text: Counter(canonical[m.lower()] for m in pattern.findall(' '.join(text.split())))
+
+
+def per_call(fn, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(text)
+    return result, (time.perf_counter() - started) / repeat
+
+
+def run(patterns, words, repeat):
+    taxonomy = make_taxonomy((patterns + 1) // 2)  # A canonical name and one alias each
+    mentioned = [spelling for name, aliases in random.Random(5).sample(taxonomy, min(20, len(taxonomy)))
+                 for spelling in (name, aliases[0])]
+    text = make_resume_text(mentioned, words)
+
+    started = time.perf_counter()
+    regex = regex_extractor(taxonomy)
+    regex_build = time.perf_counter() - started
+    started = time.perf_counter()
+    extractor = SkillExtractor((spelling, name) for name, aliases in taxonomy for spelling in [name, *aliases])
+    automaton_build = time.perf_counter() - started
+
+    expected, regex_seconds = per_call(regex, text, repeat)
+    found, automaton_seconds = per_call(extractor.counts, text, repeat)
+    assert found == expected, (found, expected)
+    print(f'{extractor.patterns:>6} patterns  {len(text):>6} chars  '
+          f'build regex {regex_build * 1e3:8.1f} ms  automaton {automaton_build * 1e3:8.1f} ms  '
+          f'scan regex {regex_seconds * 1e3:9.2f} ms  automaton {automaton_seconds * 1e3:7.2f} ms  '
+          f'speedup {regex_seconds / automaton_seconds:6.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--patterns', type=int, nargs='+', default=[10, 1000, 10_000])
+    parser.add_argument('--words', type=int, default=1500, help='resume length in words')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    for patterns in args.patterns:
+        run(patterns, args.words, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Compare the original iterrows scan in get_job_suggestions with the inverted SkillIndex.
+
+Run from the repository root:
+    python -m benchmarks.bench_skill_index --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_jobs, make_resumes
+from skill_index import SkillIndex
+
+
+# The get_job_suggestions body this index replaced
+def legacy_suggestions(job_listings, skills):
+    suggestions = []
+    for _, row in job_listings.iterrows():
+        required_skills = row['Required_Skills'].split(', ')
+        if any(skill.strip() in required_skills for skill in skills):
+            suggestions.append(row['Job_Title'])
+    return suggestions[:10]
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def run(rows, queries, legacy_queries):
+    jobs = make_jobs(rows)
+    resumes = make_resumes(queries)
+    index, build_seconds = timed(SkillIndex.from_jobs, jobs)
+
+    started = time.perf_counter()
+    results = [index.lookup(skills) for skills in resumes]
+    lookup_seconds = (time.perf_counter() - started) / queries
+
+    legacy_seconds = 0.0
+    for skills, expected in zip(resumes[:legacy_queries], results):
+        legacy, seconds = timed(legacy_suggestions, jobs, skills)
+        legacy_seconds += seconds
+        assert legacy == expected, f'mismatch for {skills}: {legacy} != {expected}'
+    legacy_seconds /= legacy_queries
+
+    print(f'{rows:>9} rows  build {build_seconds * 1e3:9.1f} ms  '
+          f'iterrows {legacy_seconds * 1e3:10.2f} ms/query  '
+          f'index {lookup_seconds * 1e6:8.1f} us/query  '
+          f'speedup {legacy_seconds / lookup_seconds:9.0f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=1000, help='index lookups timed per size')
+    parser.add_argument('--legacy-queries', type=int, default=3, help='iterrows scans timed per size')
+    args = parser.parse_args()
+    for rows in args.sizes:
+        run(rows, args.queries, args.legacy_queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Time every registered PDF text backend on a resume corpus and pick the fastest with enough skill recall.
+
+The corpus is a directory of resumes, each next to a NAME.skills file listing the
+canonical skills it mentions, one per line. Without --corpus a synthetic one is used.
+
+Run from the repository root:
+    python -m benchmarks.bench_text_extractors --corpus samples/ --min-recall 0.95
+then export the RESUME_PDF_BACKEND it prints.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import text_extractors
+from benchmarks.synthetic import make_resume_docx, make_resume_pdf
+from parse_cache import PageTextCache
+from resume_parser import ExtractionBudget, extract_skills
+from text_extractors import PDF, backend_names, detect_mime
+
+
+def write_synthetic_corpus(directory, count=60, seed=6):
+    rng = random.Random(seed)
+    skills = ['Python', 'Java', 'JavaScript', 'SQL', 'Machine Learning', 'C++', 'Docker', 'React', 'Excel', 'Git']
+    for i in range(count):
+        mentioned = rng.sample(skills, rng.randint(2, 6))
+        if i % 10 == 9:
+            name, data = f'resume{i}.docx', make_resume_docx(mentioned, seed=i)
+        else:
+            data = make_resume_pdf(mentioned, pages=rng.randint(1, 4), seed=i, compress=i % 2 == 0)
+            name = f'resume{i}.pdf'
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(data)
+        with open(os.path.join(directory, os.path.splitext(name)[0] + '.skills'), 'w') as f:
+            f.write('\n'.join(mentioned) + '\n')
+
+
+def load_corpus(directory):
+    """[(name, bytes, expected skills)] for every resume with a .skills file."""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        stem, suffix = os.path.splitext(name)
+        expected = os.path.join(directory, stem + '.skills')
+        if suffix == '.skills' or not os.path.exists(expected):
+            continue
+        with open(os.path.join(directory, name), 'rb') as f, open(expected) as g:
+            corpus.append((name, f.read(), {line.strip() for line in g if line.strip()}))
+    return corpus
+
+
+def measure(corpus, backend):
+    """(mean seconds per file, p99 seconds, mean recall, failures) for one backend."""
+    unlimited = dict(max_pages=10 ** 9, max_chars=10 ** 12, max_seconds=10 ** 9)
+    # Time real extraction, not pages shared between corpus files or left in RESUME_PAGE_CACHE_DIR
+    text_extractors.page_text_cache = PageTextCache('bench', entries=0, directory='')
+    seconds, recalls, failures = [], [], 0
+    for name, data, expected in corpus:
+        started = time.perf_counter()
+        try:
+            found, _ = extract_skills(data, ExtractionBudget(**unlimited), pdf_backend=backend)
+        except Exception:
+            found = {}
+            failures += 1
+        seconds.append(time.perf_counter() - started)
+        recalls.append(len(expected & set(found)) / len(expected) if expected else 1.0)
+    seconds.sort()
+    p99 = seconds[min(len(seconds) - 1, int(0.99 * len(seconds)))]
+    return sum(seconds) / len(seconds), p99, sum(recalls) / len(recalls), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='directory of resumes with NAME.skills answer files')
+    parser.add_argument('--min-recall', type=float, default=0.95)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as synthetic:
+        if args.corpus is None:
+            write_synthetic_corpus(synthetic)
+        corpus = load_corpus(args.corpus or synthetic)
+    pdfs = [entry for entry in corpus if detect_mime(entry[1]) == PDF]
+    others = [entry for entry in corpus if detect_mime(entry[1]) != PDF]
+    print(f'{len(pdfs)} PDFs, {len(others)} other documents')
+
+    eligible = []
+    for backend in backend_names(PDF):
+        mean, p99, recall, failures = measure(pdfs, backend)
+        print(f'{backend:<10} {mean * 1e3:8.2f} ms/file  p99 {p99 * 1e3:8.2f} ms  '
+              f'recall {recall:6.1%}  failures {failures}')
+        if recall >= args.min_recall:
+            eligible.append((mean, backend))
+    if others:
+        mean, p99, recall, failures = measure(others, None)
+        print(f'{"non-PDF":<10} {mean * 1e3:8.2f} ms/file  p99 {p99 * 1e3:8.2f} ms  '
+              f'recall {recall:6.1%}  failures {failures}')
+    if not eligible:
+        print(f'No PDF backend reaches {args.min_recall:.0%} recall; keep the default')
+        return
+    print(f'RESUME_PDF_BACKEND={min(eligible)[1]}')
+
+
+if __name__ == '__main__':
+    main()
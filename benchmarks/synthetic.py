@@ -0,0 +1,138 @@
+"""Synthetic job catalogs and resumes shared by the benchmarks."""
+import csv
+import io
+import random
+import zipfile
+import zlib
+
+import pandas as pd
+
+TITLES = ['Software Engineer', 'Data Analyst', 'Web Developer', 'ML Engineer', 'Backend Developer',
+          'Frontend Developer', 'Data Scientist', 'QA Engineer', 'DevOps Engineer', 'Product Analyst']
+
+
+def skill_vocabulary(size=300):
+    base = ['Python', 'Java', 'HTML', 'CSS', 'JavaScript', 'Machine Learning', 'SQL', 'Excel']
+    return base + [f'Skill{i}' for i in range(size - len(base))]
+
+
+def _skill_weights(vocabulary):
+    # Zipf-like: a few skills appear in a large share of postings, most are rare
+    return [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+
+
+def iter_job_rows(rows, vocab_size=300, seed=0):
+    """(Job_Title, Required_Skills) pairs, generated lazily."""
+    rng = random.Random(seed)
+    vocabulary = skill_vocabulary(vocab_size)
+    weights = _skill_weights(vocabulary)
+    for i in range(rows):
+        skills = dict.fromkeys(rng.choices(vocabulary, weights, k=rng.randint(2, 8)))
+        yield f'{rng.choice(TITLES)} #{i}', ', '.join(skills)
+
+
+def make_jobs(rows, vocab_size=300, seed=0):
+    titles, required = zip(*iter_job_rows(rows, vocab_size, seed)) if rows else ((), ())
+    return pd.DataFrame({'Job_Title': list(titles), 'Required_Skills': list(required)})
+
+
+def write_jobs_csv(path, rows, vocab_size=300, seed=0):
+    """Write a synthetic catalog CSV row by row, without holding it in memory."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Job_Title', 'Required_Skills'])
+        writer.writerows(iter_job_rows(rows, vocab_size, seed))
+
+
+def make_resumes(count, vocab_size=300, seed=1):
+    rng = random.Random(seed)
+    vocabulary = skill_vocabulary(vocab_size)
+    return [rng.sample(vocabulary, rng.randint(1, 6)) for _ in range(count)]
+
+
+FILLER = ('experience project team developed designed built maintained improved delivered '
+          'analysis reporting university degree internship responsible using with for the and').split()
+
+
+def _pdf_string(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_resume_pdf(skills, pages=2, lines_per_page=45, seed=2, compress=False):
+    """Bytes of a plain-text PDF resume that mentions each skill somewhere among filler lines.
+
+    compress=True stores the page content streams Flate-encoded, as most real PDFs do.
+    """
+    rng = random.Random(seed)
+    lines = [' '.join(rng.choices(FILLER, k=10)) for _ in range(pages * lines_per_page)]
+    for skill in skills:
+        line = rng.randrange(len(lines))
+        lines[line] = f'{lines[line]} {skill},'
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in range(pages):
+        body = '\n'.join(f'({_pdf_string(line)}) Tj T*' for line in lines[page * lines_per_page:(page + 1) * lines_per_page])
+        stream = f'BT /F1 10 Tf 14 TL 40 800 Td\n{body}\nET'.encode('latin-1')
+        flate = b''
+        if compress:
+            stream, flate = zlib.compress(stream), b' /Filter /FlateDecode'
+        objects.append(b'<< /Length %d%s >>\nstream\n%s\nendstream' % (len(stream), flate, stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(b'%d 0 R' % kid for kid in kids), pages)
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'tek', 'sql', 'net', 'py', 'da', 'vo', 'zen', 'ux', 'ops', 'lab', 'io', 'gra']
+
+
+def make_taxonomy(size, seed=3):
+    """[(canonical name, [aliases])] of made-up skills, one to three words each, with distinct spellings."""
+    rng = random.Random(seed)
+    seen = set()
+    entries = []
+    while len(entries) < size:
+        words = [''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).capitalize() for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words)
+        alias = ''.join(word[0] for word in words).upper() + str(len(entries))
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            entries.append((name, [alias]))
+    return entries
+
+
+def make_resume_text(skills, words=1500, seed=4):
+    """Prose-like filler with each skill mentioned once at a random position."""
+    rng = random.Random(seed)
+    tokens = rng.choices(FILLER, k=words)
+    for skill in skills:
+        tokens.insert(rng.randrange(len(tokens) + 1), f'{skill},')
+    return ' '.join(tokens)
+
+
+def make_resume_docx(skills, paragraphs=60, seed=2):
+    """Bytes of a minimal DOCX resume (just word/document.xml) mentioning each skill once."""
+    rng = random.Random(seed)
+    lines = [' '.join(rng.choices(FILLER, k=10)) for _ in range(paragraphs)]
+    for skill in skills:
+        line = rng.randrange(len(lines))
+        lines[line] = f'{lines[line]} {skill},'
+    body = ''.join(f'<w:p><w:r><w:t>{line.replace("&", "&amp;").replace("<", "&lt;")}</w:t></w:r></w:p>'
+                   for line in lines)
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', document)
+    return out.getvalue()
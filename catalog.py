@@ -0,0 +1,362 @@
+import csv
+import fcntl
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from catalog_delta import REMOVE, CatalogDelta
+from compiled_catalog import COMPILED_SUFFIX, CompiledCatalog, compile_rows, default_target, load_catalog
+from skill_index import SKILL_SEPARATOR
+
+# Either the CSV or a file produced by `flask compile-catalog` (*.jobcat)
+CATALOG_PATH = os.environ.get('JOB_CATALOG_PATH', './job_listings.csv')
+# Seconds between background compactions of delta files into the base catalog (0 disables)
+COMPACT_INTERVAL = float(os.environ.get('JOB_CATALOG_COMPACT_INTERVAL', '300'))
+
+# Written into the delta directory by compaction: which delta files the base with
+# base_stamp already contains, so readers never apply them twice.
+MANIFEST = 'compacted.json'
+
+
+def delta_dir_for(path):
+    """job_listings.csv and job_listings.jobcat both take deltas from job_listings.d/"""
+    return os.path.splitext(path)[0] + '.d'
+
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _added_rows(delta_dir, deltas):
+    """Raw rows (dicts) added by the delta files, in the order CatalogDelta numbered them."""
+    for name, _ in deltas:
+        with open(os.path.join(delta_dir, name), newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if (row.get('Op') or '').strip().lower() != REMOVE:
+                    yield row
+
+
+def _merge_csv(source, target, snapshot, delta_dir):
+    """Stream the base CSV minus tombstoned rows, then the added delta rows, into target.
+
+    Rows are copied as written, so every column and every original spelling survive;
+    columns that only delta files have are appended to the header.
+    """
+    removed = snapshot.delta.removed
+    extra = []
+    for name, _ in snapshot.deltas:
+        with open(os.path.join(delta_dir, name), newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        extra.extend(column for column in header if column != 'Op' and column not in extra)
+    with open(source, newline='', encoding='utf-8') as f, open(target, 'w', newline='', encoding='utf-8') as out:
+        reader = csv.reader(f)
+        writer = csv.writer(out)
+        header = next(reader)
+        extra = [column for column in extra if column not in header]
+        columns = header + extra
+        writer.writerow(columns)
+        row_id = 0
+        for row in reader:
+            if not row:
+                continue  # Blank lines aren't rows to pandas either, so they take no row id
+            if row_id not in removed:
+                writer.writerow(row + [''] * (len(columns) - len(row)))
+            row_id += 1
+        for row_id, row in enumerate(_added_rows(delta_dir, snapshot.deltas), row_id):
+            if row_id not in removed:
+                writer.writerow([row.get(column) or '' for column in columns])
+
+
+def _compiled_rows(snapshot):
+    """(title, required skills) of a compiled base minus tombstones, then the added rows, for compile_rows."""
+    delta = snapshot.delta
+    for row_id, row in enumerate(snapshot.jobs.iter_rows()):
+        if row_id not in delta.removed:
+            yield row
+    for row_id, title, skills in zip(delta.row_ids(), delta.titles, delta.skill_lists):
+        if row_id not in delta.removed:
+            yield title, SKILL_SEPARATOR.join(skills) or None
+
+
+def _title_rows(snapshot):
+    jobs = snapshot.jobs
+    titles = jobs['Job_Title'].tolist() if isinstance(jobs, pd.DataFrame) else jobs.titles.tolist()
+    rows = {}
+    for row_id, title in enumerate(titles):
+        rows.setdefault(title, []).append(row_id)
+    return rows
+
+
+def live_frame(snapshot):
+    """The snapshot's live jobs as one DataFrame: base rows minus tombstones plus added rows."""
+    jobs = snapshot.jobs if isinstance(snapshot.jobs, pd.DataFrame) else snapshot.jobs.to_frame()
+    delta = snapshot.delta
+    if delta is None:
+        return jobs
+    added = pd.DataFrame({
+        'Job_Title': delta.titles,
+        'Required_Skills': [SKILL_SEPARATOR.join(skills) for skills in delta.skill_lists],
+    })
+    frame = pd.concat([jobs, added], ignore_index=True)
+    return frame.drop(index=sorted(delta.removed)).reset_index(drop=True)
+
+
+class CatalogSnapshot:
+    """One fully loaded, read-only version of the job catalog.
+
+    A snapshot is either a base (the catalog file as loaded) or a base plus a
+    CatalogDelta. Structures derived from a delta snapshot are built by applying
+    the delta to the base's structure, so they never rescan the whole catalog.
+    """
+
+    def __init__(self, jobs, version, stamp, loaded_at, load_seconds, base=None, delta=None, deltas=()):
+        self.jobs = jobs
+        self.version = version
+        self.stamp = stamp
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+        self.base = base or self
+        self.delta = delta
+        self.deltas = deltas
+        self._derived = {}
+        self._factories = {}
+        self._derive_lock = threading.RLock()
+
+    def __len__(self):
+        if self.delta is None:
+            return len(self.jobs)
+        return len(self.jobs) + len(self.delta) - len(self.delta.removed)
+
+    def derive(self, name, factory):
+        """Build a structure from this snapshot on first use and reuse it for the snapshot's lifetime."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        with self._derive_lock:
+            if name not in self._derived:
+                if self.delta is None:
+                    self._derived[name] = factory(self)
+                else:
+                    self._derived[name] = self.base.derive(name, factory).with_delta(self.delta)
+                self._factories[name] = factory
+            return self._derived[name]
+
+
+class JobCatalog:
+    """Process-wide job catalog that is parsed once and reloaded only when the file changes.
+
+    Readers always get a complete snapshot: a reload builds the new snapshot
+    off to the side and then replaces the reference in a single assignment.
+
+    New postings and tombstones can be dropped into the delta directory as CSV
+    files (see catalog_delta). New delta files are applied on top of the current
+    base without reparsing it; compact() folds them back into the base file.
+    Write delta files under another name and rename them in, so a reader never
+    sees one half-written.
+    """
+
+    def __init__(self, path=CATALOG_PATH, loader=load_catalog, delta_dir=None):
+        self.path = path
+        self.delta_dir = delta_dir or delta_dir_for(path)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._failed = None
+        self._version = 0
+        self._compactor = None
+
+    def _stamp(self):
+        stamp = _file_stamp(self.path)
+        if not self.path.endswith(COMPILED_SUFFIX):
+            # A large CSV is served from its compiled sibling, which compaction rewrites
+            try:
+                stamp += _file_stamp(default_target(self.path))
+            except FileNotFoundError:
+                pass
+        return stamp
+
+    def _folded(self, stamp):
+        try:
+            with open(os.path.join(self.delta_dir, MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        return set(manifest['folded']) if tuple(manifest['base_stamp']) == stamp else set()
+
+    def _pending_deltas(self, stamp):
+        """(name, stamp) of the delta files that belong on top of the base with this stamp."""
+        try:
+            names = sorted(os.listdir(self.delta_dir))
+        except FileNotFoundError:
+            return ()
+        folded = self._folded(stamp) if MANIFEST in names else set()
+        deltas = []
+        for name in names:
+            if not name.endswith('.csv') or name in folded:
+                continue
+            try:
+                st = os.stat(os.path.join(self.delta_dir, name))
+            except FileNotFoundError:
+                continue  # Deleted by a compaction since we listed the directory
+            deltas.append((name, (st.st_mtime_ns, st.st_size)))
+        return tuple(deltas)
+
+    def _is_current(self, snapshot, state):
+        return snapshot is not None and (state == (snapshot.stamp, snapshot.deltas) or state == self._failed)
+
+    def get(self):
+        """Return the current snapshot, reloading first if the file or its deltas changed on disk."""
+        snapshot = self._snapshot
+        try:
+            stamp = self._stamp()
+        except OSError:
+            if snapshot is None:
+                raise
+            return snapshot  # File is being replaced; keep serving what we have
+        state = (stamp, self._pending_deltas(stamp))
+        if self._is_current(snapshot, state):
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if not self._is_current(snapshot, state):
+                snapshot = self._reload(*state)
+        return snapshot
+
+    def _reload(self, stamp, deltas):
+        started = time.perf_counter()
+        current = self._snapshot
+        try:
+            if current is not None and current.stamp == stamp and deltas[:len(current.deltas)] == current.deltas:
+                # Same base and only new delta files: cost is proportional to the new deltas
+                base, delta, new = current.base, current.delta, deltas[len(current.deltas):]
+            else:
+                base, delta, new = self._load_base(stamp), None, deltas
+                if base.stamp != stamp:
+                    # Loading compiled a large CSV's sibling file, which is part of the stamp
+                    stamp = base.stamp
+                    deltas = new = self._pending_deltas(stamp)
+            for name, _ in new:
+                frame = pd.read_csv(os.path.join(self.delta_dir, name))
+                delta = (delta or CatalogDelta(len(base.jobs))).extended(
+                    frame, lambda: base.derive('title_rows', _title_rows))
+        except Exception as e:
+            if current is None:
+                raise
+            # Most likely a half-written file; don't retry until something changes again
+            print(f"Error reloading job catalog: {e}")
+            self._failed = (stamp, deltas)
+            return current
+        if delta is None:
+            snapshot = base
+        else:
+            self._version += 1
+            snapshot = CatalogSnapshot(base.jobs, self._version, stamp, time.time(),
+                                       time.perf_counter() - started, base=base, delta=delta, deltas=deltas)
+        self._snapshot = snapshot
+        self._failed = None
+        return snapshot
+
+    def _load_base(self, stamp):
+        started = time.perf_counter()
+        jobs = self._loader(self.path)
+        self._version += 1
+        if isinstance(jobs, CompiledCatalog) and not self.path.endswith(COMPILED_SUFFIX):
+            stamp = self._stamp()
+        return CatalogSnapshot(jobs, self._version, stamp, time.time(), time.perf_counter() - started)
+
+    def compact(self):
+        """Fold the applied delta files into the base catalog file and delete them.
+
+        A CSV base is rewritten by streaming its rows and the delta files' rows, so
+        columns and spellings are kept as written. A compiled base (a .jobcat, or the
+        compiled sibling a large CSV is served from) is recompiled from its own rows
+        and the deltas; the large CSV itself is left alone, and from then on the
+        compiled file holds the folded jobs. Only one process compacts at a time;
+        returns False if there was nothing to do, another process holds the
+        compaction lock, or the files changed underneath the compaction.
+        """
+        if self.get().delta is None:
+            return False
+        with open(os.path.join(self.delta_dir, '.compact.lock'), 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            snapshot = self.get()
+            if snapshot.delta is None:
+                return False
+            compiled = isinstance(snapshot.jobs, CompiledCatalog)
+            target = snapshot.jobs.path if compiled else self.path
+            tmp = f'{target}.compact.{os.getpid()}'
+            try:
+                if compiled:
+                    compile_rows(_compiled_rows(snapshot), tmp)
+                else:
+                    _merge_csv(self.path, tmp, snapshot, self.delta_dir)
+                if (self._stamp(), self._pending_deltas(snapshot.stamp)[:len(snapshot.deltas)]) != \
+                        (snapshot.stamp, snapshot.deltas):
+                    return False  # Base or a delta file was replaced while we read them
+                # Rename keeps the mtime, so the manifest can name the base before it is swapped in
+                if target == self.path:
+                    base_stamp = _file_stamp(tmp) + snapshot.stamp[2:]
+                else:
+                    base_stamp = snapshot.stamp[:2] + _file_stamp(tmp)
+                manifest = {'base_stamp': list(base_stamp), 'folded': [name for name, _ in snapshot.deltas]}
+                manifest_tmp = os.path.join(self.delta_dir, f'{MANIFEST}.{os.getpid()}')
+                with open(manifest_tmp, 'w') as f:
+                    json.dump(manifest, f)
+                os.replace(manifest_tmp, os.path.join(self.delta_dir, MANIFEST))
+                os.replace(tmp, target)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            for name, _ in snapshot.deltas:
+                try:
+                    os.remove(os.path.join(self.delta_dir, name))
+                except FileNotFoundError:
+                    pass
+        # Reload and rebuild what requests were using here, rather than on the next request
+        fresh = self.get()
+        for name, factory in snapshot.base._factories.items():
+            fresh.derive(name, factory)
+        return True
+
+    def start_compaction(self, interval=COMPACT_INTERVAL):
+        """Compact in a daemon thread every `interval` seconds."""
+        if interval <= 0 or self._compactor is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Error compacting job catalog: {e}")
+
+        self._compactor = threading.Thread(target=run, name='catalog-compactor', daemon=True)
+        self._compactor.start()
+
+    def stats(self):
+        """Version, load time and size of the current snapshot."""
+        snapshot = self.get()
+        delta = snapshot.delta
+        return {
+            'path': self.path,
+            'version': snapshot.version,
+            'rows': len(snapshot),
+            'loaded_at': snapshot.loaded_at,
+            'load_seconds': snapshot.load_seconds,
+            'delta_files': len(snapshot.deltas),
+            'delta_rows': len(delta) if delta is not None else 0,
+            'removed_rows': len(delta.removed) if delta is not None else 0,
+        }
+
+
+# Shared by every request handled in this process
+job_catalog = JobCatalog()
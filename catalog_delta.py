@@ -0,0 +1,55 @@
+from skill_index import split_skills
+
+# Delta files are CSVs with the catalog's columns plus an optional Op column.
+# Op is 'add' (the default) or 'remove'; a remove row is a tombstone for every
+# live job with that Job_Title.
+REMOVE = 'remove'
+
+
+def _column(frame, name):
+    # Tombstone-only delta files don't need a Required_Skills column
+    return frame[name].tolist() if name in frame else [None] * len(frame)
+
+
+class CatalogDelta:
+    """Jobs added and removed on top of a base catalog since it was last compacted.
+
+    Added rows get ids after the last base row, so posting lists stay sorted.
+    """
+
+    def __init__(self, base_rows, titles=(), skill_lists=(), removed=frozenset()):
+        self.base_rows = base_rows
+        self.titles = list(titles)
+        self.skill_lists = list(skill_lists)
+        self.removed = frozenset(removed)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def row_ids(self):
+        return range(self.base_rows, self.base_rows + len(self.titles))
+
+    def extended(self, frame, base_title_rows):
+        """A new delta with one delta file applied in row order.
+
+        base_title_rows is called (at most once) to get the title -> row ids map of the base.
+        """
+        titles = list(self.titles)
+        skill_lists = list(self.skill_lists)
+        removed = set(self.removed)
+        base_by_title = None
+        added_by_title = {}
+        for row_id, title in zip(self.row_ids(), titles):
+            added_by_title.setdefault(title, []).append(row_id)
+        ops = _column(frame, 'Op')
+        for title, required, op in zip(frame['Job_Title'].tolist(), _column(frame, 'Required_Skills'), ops):
+            if isinstance(op, str) and op.strip().lower() == REMOVE:
+                if base_by_title is None:
+                    base_by_title = base_title_rows()
+                removed.update(base_by_title.get(title, ()))
+                removed.update(added_by_title.get(title, ()))
+                continue
+            added_by_title.setdefault(title, []).append(self.base_rows + len(titles))
+            titles.append(title)
+            skill_lists.append(split_skills(required))
+        return CatalogDelta(self.base_rows, titles, skill_lists, removed)
@@ -0,0 +1,340 @@
+import csv
+import json
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ranking import SparseRanker
+from skill_index import SKILL_SEPARATOR, SkillIndex, split_skills
+from skill_vocabulary import skill_vocabulary
+
+# Layout: magic, header length (uint64 LE), JSON header, then 64-byte aligned arrays.
+# The header maps each array name to its dtype, shape and byte offset in the file.
+MAGIC = b'JOBCAT01'
+ALIGNMENT = 64
+COMPILED_SUFFIX = '.jobcat'
+
+# Rows buffered before the compiler spills them to disk
+CHUNK_ROWS = 50_000
+# Memory for transposing job x skill entries into posting lists; larger catalogs take more passes
+SORT_BUDGET_BYTES = 16 << 20
+# CSVs larger than this are stream-compiled next to themselves and memory-mapped
+# instead of being parsed into a DataFrame
+STREAM_THRESHOLD_BYTES = int(os.environ.get('JOB_CATALOG_STREAM_BYTES', 256 << 20))
+
+
+def default_target(source):
+    return os.path.splitext(source)[0] + COMPILED_SUFFIX
+
+
+def _string_table(values):
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _index_dtype(count):
+    # SciPy only keeps our buffers (instead of copying them) when indices and indptr share a dtype
+    return np.int32 if count < 2 ** 31 else np.int64
+
+
+def iter_job_rows(source):
+    """(Job_Title, Required_Skills) for each row of a CSV, read one row at a time."""
+    with open(source, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        title_col, skills_col = header.index('Job_Title'), header.index('Required_Skills')
+        width = max(title_col, skills_col) + 1
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            # An empty cell is a job without skills, as pandas' NaN was
+            yield row[title_col], row[skills_col] or None
+
+
+def compile_catalog(source, target=None):
+    """Turn a job listings CSV into a columnar file that workers can memory-map.
+
+    The CSV is streamed, so memory use depends on CHUNK_ROWS, SORT_BUDGET_BYTES
+    and the number of distinct skills, not on the size of the file.
+    """
+    target = target or default_target(source)
+    return compile_rows(iter_job_rows(source), target)
+
+
+class _Spill:
+    """Append-only int64 or byte column buffered in memory and flushed to a temp file."""
+
+    def __init__(self, directory, name, dtype):
+        self.path = os.path.join(directory, name)
+        self.dtype = np.dtype(dtype)
+        self.file = open(self.path, 'w+b')
+        self.buffer = bytearray() if self.dtype == np.uint8 else array('q')
+        self.count = 0
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.count += len(self.buffer)
+        del self.buffer[:]
+
+    def read(self, start, count):
+        self.file.seek(start * self.dtype.itemsize)
+        return np.fromfile(self.file, dtype=self.dtype, count=count)
+
+    def chunks(self, dtype=None, chunk=CHUNK_ROWS * 8):
+        """The spilled values in order, converted to dtype, one chunk at a time."""
+        for start in range(0, self.count, chunk):
+            values = self.read(start, min(chunk, self.count - start))
+            yield values if dtype is None else values.astype(dtype)
+
+
+def compile_rows(rows, target):
+    """Write a compiled catalog from an iterable of (title, required_skills) pairs.
+
+    Columns are spilled to temp files as the rows stream past; only the skill
+    vocabulary and per-skill counts stay in memory. Skills are written under their
+    canonical names, so aliases of one skill share a column; recompile after
+    changing the skill taxonomy.
+    """
+    spill_dir = tempfile.mkdtemp(prefix='jobcat-', dir=os.path.dirname(os.path.abspath(target)))
+    title_bytes = _Spill(spill_dir, 'title_bytes', np.uint8)
+    title_offsets = _Spill(spill_dir, 'title_offsets', np.int64)
+    job_ptr = _Spill(spill_dir, 'job_ptr', np.int64)
+    job_skills = _Spill(spill_dir, 'job_skills', np.int64)
+    spills = [title_bytes, title_offsets, job_ptr, job_skills]
+    try:
+        vocabulary = {}
+        counts = array('q')
+        title_size = nnz = rows_seen = 0
+        title_offsets.buffer.append(0)
+        job_ptr.buffer.append(0)
+        for title, required in rows:
+            encoded = title.encode('utf-8')
+            title_bytes.buffer += encoded
+            title_size += len(encoded)
+            title_offsets.buffer.append(title_size)
+            for skill_id in skill_vocabulary.intern_all(split_skills(required)):
+                column = vocabulary.get(skill_id)
+                if column is None:
+                    column = vocabulary[skill_id] = len(counts)
+                    counts.append(0)
+                counts[column] += 1
+                job_skills.buffer.append(column)
+                nnz += 1
+            job_ptr.buffer.append(nnz)
+            rows_seen += 1
+            if rows_seen % CHUNK_ROWS == 0:
+                for spill in spills:
+                    spill.flush()
+        for spill in spills:
+            spill.flush()
+
+        index_dtype = _index_dtype(max(nnz, rows_seen))
+        skill_ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(np.frombuffer(counts, dtype=np.int64), out=skill_ptr[1:])
+        skill_offsets, skill_bytes = _string_table(map(skill_vocabulary.name, vocabulary))
+        weights = (np.ones(min(CHUNK_ROWS * 8, nnz - start), dtype=np.float32)
+                   for start in range(0, nnz, CHUNK_ROWS * 8))
+        arrays = {
+            'title_offsets': (np.int64, rows_seen + 1, title_offsets.chunks()),
+            'title_bytes': (np.uint8, title_size, title_bytes.chunks()),
+            'skill_offsets': (np.int64, len(skill_offsets), [skill_offsets]),
+            'skill_bytes': (np.uint8, len(skill_bytes), [skill_bytes]),
+            'job_ptr': (index_dtype, rows_seen + 1, job_ptr.chunks(index_dtype)),
+            'job_skills': (index_dtype, nnz, job_skills.chunks(index_dtype)),
+            'job_weights': (np.float32, nnz, weights),
+            'skill_ptr': (index_dtype, len(skill_ptr), [skill_ptr.astype(index_dtype)]),
+            'skill_jobs': (index_dtype, nnz, _posting_chunks(job_ptr, job_skills, skill_ptr, index_dtype)),
+        }
+        _write(target, {'rows': rows_seen, 'skills': len(vocabulary)}, arrays)
+    finally:
+        for spill in spills:
+            spill.file.close()
+        shutil.rmtree(spill_dir, ignore_errors=True)
+    return target
+
+
+def _entries(job_ptr, job_skills, rows):
+    """(skill columns, row ids) of every job x skill entry, in row order, a chunk of rows at a time."""
+    for start in range(0, rows, CHUNK_ROWS):
+        ptr = job_ptr.read(start, min(CHUNK_ROWS, rows - start) + 1)
+        columns = job_skills.read(ptr[0], ptr[-1] - ptr[0])
+        yield columns, np.repeat(np.arange(start, start + len(ptr) - 1), np.diff(ptr))
+
+
+def _posting_chunks(job_ptr, job_skills, skill_ptr, dtype):
+    """Each skill's row ids in ascending order: the CSC transpose of the spilled CSR arrays.
+
+    Every pass over the spilled entries fills the posting lists of a contiguous range
+    of skills that fits in SORT_BUDGET_BYTES, so the transpose never needs all of them
+    in memory at once.
+    """
+    rows = job_ptr.count - 1
+    budget = max(1, SORT_BUDGET_BYTES // np.dtype(dtype).itemsize)
+    first = 0
+    while first < len(skill_ptr) - 1:
+        last = int(np.searchsorted(skill_ptr, skill_ptr[first] + budget, side='right')) - 1
+        last = min(max(last, first + 1), len(skill_ptr) - 1)
+        base = skill_ptr[first]
+        postings = np.empty(skill_ptr[last] - base, dtype=dtype)
+        cursor = skill_ptr[first:last] - base
+        for columns, row_ids in _entries(job_ptr, job_skills, rows):
+            keep = (columns >= first) & (columns < last)
+            columns, row_ids = columns[keep], row_ids[keep]
+            order = np.argsort(columns, kind='stable')
+            columns, row_ids = columns[order] - first, row_ids[order]
+            present, starts, sizes = np.unique(columns, return_index=True, return_counts=True)
+            rank = np.arange(len(columns)) - np.repeat(starts, sizes)
+            postings[cursor[columns] + rank] = row_ids
+            cursor[present] += sizes
+        yield postings
+        first = last
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _write(target, header, arrays):
+    """Write arrays given as name -> (dtype, length, iterable of chunks)."""
+    layout = {}
+    offset = 0
+    for name, (dtype, length, _) in arrays.items():
+        dtype = np.dtype(dtype)
+        layout[name] = {'dtype': dtype.str, 'shape': [length], 'offset': offset}
+        offset = _align(offset + length * dtype.itemsize)
+    header = dict(header, arrays=layout)
+    encoded = json.dumps(header).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(encoded))
+
+    # Write next to the target and rename, so a running worker never maps a partial file
+    tmp = f'{target}.tmp.{os.getpid()}'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(encoded)) + encoded)
+        for name, (dtype, _, chunks) in arrays.items():
+            f.seek(data_start + layout[name]['offset'])
+            for chunk in chunks:
+                f.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, target)
+
+
+class StringTable:
+    """Read-only sequence of strings stored as one UTF-8 blob plus offsets."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def tolist(self):
+        data = bytes(self.blob)
+        bounds = self.offsets.tolist()
+        return [data[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+
+class PostingLists:
+    """Mapping from skill id to its row ids, backed by the CSC arrays of a compiled catalog."""
+
+    def __init__(self, vocabulary, skill_ptr, skill_jobs):
+        self.vocabulary = vocabulary
+        self.skill_ptr = skill_ptr
+        self.skill_jobs = skill_jobs
+
+    def __contains__(self, skill):
+        return skill in self.vocabulary
+
+    def __getitem__(self, skill):
+        column = self.vocabulary[skill]
+        return self.skill_jobs[self.skill_ptr[column]:self.skill_ptr[column + 1]]
+
+
+class CompiledCatalog:
+    """A memory-mapped compiled catalog; all arrays are read-only views of the page cache."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a compiled job catalog")
+            (length,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(length))
+        data_start = _align(len(MAGIC) + 8 + length)
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        self.arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            start = data_start + spec['offset']
+            count = int(np.prod(spec['shape']))
+            self.arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+        self.rows = header['rows']
+        self.titles = StringTable(self.arrays['title_offsets'], self.arrays['title_bytes'])
+        self.skills = StringTable(self.arrays['skill_offsets'], self.arrays['skill_bytes'])
+        # Skill id -> column
+        self.vocabulary = {skill_vocabulary.intern(skill): column for column, skill in enumerate(self.skills.tolist())}
+        if len(self.vocabulary) < len(self.skills):
+            raise ValueError(f"{path} was compiled with a different skill taxonomy; recompile it")
+
+    def __len__(self):
+        return self.rows
+
+    def skill_index(self):
+        postings = PostingLists(self.vocabulary, self.arrays['skill_ptr'], self.arrays['skill_jobs'])
+        return SkillIndex(self.titles, postings)
+
+    def sparse_ranker(self):
+        matrix = sparse.csr_matrix(
+            (self.arrays['job_weights'], self.arrays['job_skills'], self.arrays['job_ptr']),
+            shape=(self.rows, len(self.vocabulary)))
+        return SparseRanker(self.titles, self.vocabulary, matrix)
+
+    def iter_rows(self):
+        """(title, required skills) of each row in order, decoded a chunk at a time; None for a job without skills."""
+        skills = self.skills.tolist()
+        job_ptr, job_skills = self.arrays['job_ptr'], self.arrays['job_skills']
+        for start in range(0, self.rows, CHUNK_ROWS):
+            end = min(start + CHUNK_ROWS, self.rows)
+            ptr = job_ptr[start:end + 1].tolist()
+            columns = job_skills[ptr[0]:ptr[-1]].tolist()
+            for row, (first, last) in enumerate(zip(ptr, ptr[1:]), start):
+                required = SKILL_SEPARATOR.join(skills[c] for c in columns[first - ptr[0]:last - ptr[0]])
+                yield self.titles[row], required or None
+
+    def to_frame(self):
+        """Rebuild a DataFrame in the CSV's shape (duplicate skills within a row are dropped)."""
+        skills = self.skills.tolist()
+        ptr = self.arrays['job_ptr'].tolist()
+        columns = self.arrays['job_skills'].tolist()
+        required = [SKILL_SEPARATOR.join(skills[c] for c in columns[start:end]) or None
+                    for start, end in zip(ptr, ptr[1:])]
+        return pd.DataFrame({'Job_Title': self.titles.tolist(), 'Required_Skills': required})
+
+
+def load_catalog(path):
+    """Catalog loader for JobCatalog: memory-maps compiled files, parses anything else as CSV.
+
+    CSVs above STREAM_THRESHOLD_BYTES are compiled (once per change) and mapped too,
+    so peak memory doesn't grow with the size of the file.
+    """
+    if path.endswith(COMPILED_SUFFIX):
+        return CompiledCatalog(path)
+    if os.path.getsize(path) > STREAM_THRESHOLD_BYTES:
+        target = default_target(path)
+        if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(path):
+            compile_catalog(path, target)
+        return CompiledCatalog(target)
+    return pd.read_csv(path)
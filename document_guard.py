@@ -0,0 +1,116 @@
+import io
+import os
+import re
+import zipfile
+import zlib
+
+from parse_cache import RESUME_CACHE_DIR, ParseCache
+from text_extractors import DOCX, PDF, detect_mime
+
+# Structural limits checked before a document is handed to a full parser
+MAX_PDF_OBJECTS = 20_000
+MAX_NESTING = 64
+# Bytes all compressed streams (or zip members) of one upload may inflate to
+MAX_INFLATED_BYTES = int(os.environ.get('RESUME_MAX_INFLATED_BYTES', 64 << 20))
+MAX_DOCX_MEMBERS = 2_000
+# Hashes of files that failed to parse, shared by workers through a directory if one is set
+RESUME_QUARANTINE_DIR = os.environ.get(
+    'RESUME_QUARANTINE_DIR', os.path.join(RESUME_CACHE_DIR, 'quarantine') if RESUME_CACHE_DIR else '')
+QUARANTINE_ENTRIES = 10_000
+# The least recently seen entries are deleted once the directory grows past this
+RESUME_QUARANTINE_MAX_BYTES = int(os.environ.get('RESUME_QUARANTINE_MAX_BYTES', 16 << 20))
+
+_DEEP_NESTING = re.compile(rb'(?:<<\s*){%d}|(?:\[\s*){%d}' % (MAX_NESTING, MAX_NESTING))
+_STREAM_START = re.compile(rb'(?<!end)stream\r?\n')
+
+
+class RejectedDocument(ValueError):
+    """The upload failed a structural check and was not parsed."""
+
+
+def check_document(data):
+    """Cheap structural checks that reject decompression bombs and pathological files before parsing."""
+    mime = detect_mime(data)
+    if mime == PDF:
+        _check_pdf(data)
+    elif mime == DOCX:
+        _check_docx(data)
+
+
+def _check_pdf(data):
+    if b'%%EOF' not in data[-2048:]:
+        raise RejectedDocument("PDF is truncated (no %%EOF marker)")
+    if data.count(b' obj') > MAX_PDF_OBJECTS:
+        raise RejectedDocument(f"PDF has more than {MAX_PDF_OBJECTS} objects")
+    if _DEEP_NESTING.search(data):
+        raise RejectedDocument(f"PDF nests dictionaries or arrays more than {MAX_NESTING} deep")
+    # Inflate every Flate stream against one shared budget; a bomb runs out of it quickly
+    budget = MAX_INFLATED_BYTES
+    for start in _flate_streams(data):
+        end = data.find(b'endstream', start)
+        inflater = zlib.decompressobj()
+        try:
+            budget -= len(inflater.decompress(data[start:end if end >= 0 else None], budget + 1))
+        except zlib.error:
+            continue  # Damaged streams are the parser's problem, not a bomb
+        if budget < 0:
+            raise RejectedDocument(f"PDF streams inflate to more than {MAX_INFLATED_BYTES} bytes")
+
+
+def _flate_streams(data):
+    """Offsets where the data of each stream whose dictionary names /FlateDecode starts.
+
+    The stream keyword is looked for after /FlateDecode rather than after the dictionary's
+    closing >>, so nested dictionaries such as /DecodeParms << ... >> don't hide a stream;
+    an endobj in between means /FlateDecode belonged to an object without a stream.
+    """
+    position = 0
+    while True:
+        found = data.find(b'/FlateDecode', position)
+        if found < 0:
+            return
+        match = _STREAM_START.search(data, found)
+        if match is None:
+            return
+        end_object = data.find(b'endobj', found, match.start())
+        if end_object >= 0:
+            position = end_object
+            continue
+        yield match.end()
+        position = match.end()
+
+
+def _check_docx(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = archive.infolist()
+    if len(members) > MAX_DOCX_MEMBERS:
+        raise RejectedDocument(f"DOCX has more than {MAX_DOCX_MEMBERS} parts")
+    if sum(member.file_size for member in members) > MAX_INFLATED_BYTES:
+        raise RejectedDocument(f"DOCX inflates to more than {MAX_INFLATED_BYTES} bytes")
+
+
+class Quarantine(ParseCache):
+    """Content keys of files that failed to parse, so the same file is refused at once next time.
+
+    A ParseCache of failure reasons: kept in memory and, with a directory, on disk for
+    every worker process, bounded the same way. Entries record the parser's fingerprint,
+    so a file that failed under one extractor or configuration is tried again under another.
+    """
+
+    field = 'reason'
+    _load = _store = staticmethod(str)
+
+    def __init__(self, fingerprint='', entries=QUARANTINE_ENTRIES, directory=RESUME_QUARANTINE_DIR,
+                 max_bytes=RESUME_QUARANTINE_MAX_BYTES):
+        super().__init__(fingerprint, entries, directory, max_bytes)
+
+    def __contains__(self, key):
+        return self.get(key, record=False) is not None
+
+    def add(self, key, reason):
+        print(f"Quarantined resume {key}: {reason}")
+        self.put(key, reason)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory)
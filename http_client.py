@@ -0,0 +1,68 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+# Seconds to open a connection and to wait between bytes of the response
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '3.05'))
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '10'))
+# Retries of a failed connection, read or retryable status, with exponential backoff plus jitter
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+HTTP_BACKOFF = float(os.environ.get('HTTP_BACKOFF', '0.5'))
+HTTP_BACKOFF_JITTER = float(os.environ.get('HTTP_BACKOFF_JITTER', '0.5'))
+# Hosts with a kept-alive connection pool, and connections kept per host
+HTTP_POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', '8'))
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '16'))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def make_session():
+    """A requests Session with pooled keep-alive connections, retries and compressed responses."""
+    retry = Retry(total=HTTP_RETRIES, connect=HTTP_RETRIES, read=HTTP_RETRIES, status=HTTP_RETRIES,
+                  allowed_methods=frozenset({'GET', 'HEAD'}), status_forcelist=RETRY_STATUSES,
+                  backoff_factor=HTTP_BACKOFF, backoff_jitter=HTTP_BACKOFF_JITTER,
+                  respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # gzip and deflate always; br (and zstd) only when urllib3 has a decoder installed for them
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return session
+
+
+def session():
+    """The process's shared Session, so every scraper and thread reuses the same connection pools.
+
+    A forked child starts its own instead of sharing the parent's sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session_pid != pid:
+        with _lock:
+            if _session_pid != pid:
+                _session = make_session()
+                _session_pid = pid
+    return _session
+
+
+def get(url, timeout=None, **kwargs):
+    """requests.get through the pooled session, with (connect, read) timeouts applied by default."""
+    return session().get(url, timeout=timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), **kwargs)
+
+
+def close():
+    """Close the pooled connections, e.g. at shutdown."""
+    global _session_pid
+    with _lock:
+        if _session_pid == os.getpid():
+            _session.close()
+        _session_pid = None
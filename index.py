@@ -1,64 +1,219 @@
-from flask import Flask, request, render_template_string, session
+from flask import Flask, Request, request, render_template_string, session, jsonify
 import os
-import PyPDF2
-import re
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import click
+
+from catalog import job_catalog, live_frame
+from compiled_catalog import compile_catalog, default_target
+from internship_crawler import (INTERNSHIP_CRAWL_CONCURRENCY, INTERNSHIP_CRAWL_INTERVAL, INTERNSHIP_CRAWL_POLL,
+                                INTERNSHIP_CRAWL_SKILLS, crawl_once, run as run_crawler)
+from internship_store import INTERNSHIP_STORE_PATH, InternshipStore
+from job_store import JOB_STORE_PATH, SqliteJobStore, build_job_store, check_mode
+from listing_cache import ListingCache, skills_key
+from ranking import suggestion_engine
+from resume_ingest import ingest
+from resume_parser import ParseJobNotFound, ParserUnavailable, ParseTimeout, QuarantinedDocument, resume_parser
+from scrapers import MAX_LISTINGS, scrape_internships, scrape_linkedin_jobs
+from skill_vocabulary import skill_vocabulary
+
+# Uploads are parsed straight from the request: in memory up to RESUME_SPOOL_BYTES,
+# spooled to an anonymous temp file above that, and rejected with 413 above RESUME_MAX_BYTES
+RESUME_SPOOL_BYTES = int(os.environ.get('RESUME_SPOOL_BYTES', 2 << 20))
+RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', 10 << 20))
+# Times /jobs waits out a parse before dropping the upload and asking for it again
+RESUME_JOB_ATTEMPTS = int(os.environ.get('RESUME_JOB_ATTEMPTS', '3'))
+
+class SpooledUploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=RESUME_SPOOL_BYTES, mode='rb+')
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'
+app.request_class = SpooledUploadRequest
+app.config['MAX_CONTENT_LENGTH'] = RESUME_MAX_BYTES
+
+# 'ranked' orders jobs by how many resume skills they require, 'tfidf' by cosine
+# similarity with rare skills weighted up, 'filter' keeps the first matches in file order
+SUGGESTION_MODE = os.environ.get('JOB_SUGGESTION_MODE', 'ranked')
+# 'memory' serves suggestions from the in-process catalog, 'sqlite' from the job store
+# built by `flask build-job-store`
+CATALOG_BACKEND = os.environ.get('JOB_CATALOG_BACKEND', 'memory')
+if CATALOG_BACKEND == 'sqlite':
+    check_mode(SUGGESTION_MODE)  # Fail at startup rather than on every /jobs
+# Most skill sets accepted by one /api/suggestions/batch call
+MAX_BATCH_SIZE = int(os.environ.get('JOB_SUGGESTION_MAX_BATCH', '10000'))
+# Internships are searched one skill at a time, for at most this many of a resume's skills
+INTERNSHIP_FANOUT_SKILLS = int(os.environ.get('INTERNSHIP_FANOUT_SKILLS', '10'))
+# Threads fetching external listings for /jobs, and seconds a page waits for them. By default one
+# page's fetches (its internship searches, the LinkedIn search and the request count) all run at once
+JOBS_FETCH_WORKERS = int(os.environ.get('JOBS_FETCH_WORKERS', str(INTERNSHIP_FANOUT_SKILLS + 2)))
+JOBS_FETCH_TIMEOUT = float(os.environ.get('JOBS_FETCH_TIMEOUT', '15'))
+# Fetches queued or running across all requests; past this a page is served without the sources it can't queue
+JOBS_FETCH_QUEUE = int(os.environ.get('JOBS_FETCH_QUEUE', str(4 * JOBS_FETCH_WORKERS)))
+job_store = SqliteJobStore(JOB_STORE_PATH)
+internship_cache = ListingCache()
+# Listings kept fresh by `flask crawl-internships`; None searches Internshala live
+internship_store = InternshipStore(INTERNSHIP_STORE_PATH) if INTERNSHIP_STORE_PATH else None
+linkedin_cache = ListingCache()
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+_fetch_slots = threading.BoundedSemaphore(JOBS_FETCH_QUEUE)
+_background_started = False
+_background_lock = threading.Lock()
 
 # Create necessary directories
-os.makedirs('uploads', exist_ok=True)
 os.makedirs('applications', exist_ok=True)
 
-# Load job listings from CSV
+# Start the resume parser workers and the job_listings.d/ compaction thread with the first request,
+# so CLI commands run without them. The workers fork first, before this process starts threads of its own.
+@app.before_request
+def start_background_work():
+    global _background_started
+    if _background_started:
+        return
+    with _background_lock:
+        if not _background_started:
+            resume_parser.start()
+            job_catalog.start_compaction()
+            _background_started = True
+
+# Load job listings from the in-memory catalog (re-parsed only when the CSV changes).
+# The DataFrame is shared between requests, so treat it as read-only.
 def load_job_listings():
-    df = pd.read_csv('./job_listings.csv')  # Adjust the path to your git add git add git add .
-    return df
+    return live_frame(job_catalog.get())
 
-# Fetch internships
-def fetch_internships(query):
-    url = f"https://internshala.com/internships/keywords-{query.replace(' ', '-')}"
+# Fetch internships for one skill from the crawled store. A skill the crawler hasn't seen
+# (or last crawled more than INTERNSHIP_STORE_MAX_AGE ago) is searched live (through the cache, so concurrent requests share one search) and saved,
+# after which the crawler keeps it fresh. The list is shared between requests, so treat it as read-only.
+def fetch_skill_internships(skill):
+    if internship_store is not None:
+        try:
+            stored = internship_store.lookup(skill)
+            if stored is not None:
+                return stored
+        except sqlite3.Error as e:
+            print(f"Error reading internship store: {e}")
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        internships = []
-        listings = soup.find_all('div', class_='internship_meta')
-        for listing in listings[:10]:
-            try:
-                title = listing.find('h3').get_text(strip=True)
-                company_tag = listing.find('a', class_='link_display_like_text')
-                company = company_tag.get_text(strip=True) if company_tag else "N/A"
-                link = "https://internshala.com" + listing.find('a')['href']
-                internships.append({'title': title, 'company': company, 'link': link})
-            except AttributeError:
-                continue
-        return internships
+        internships = internship_cache.get(skills_key([skill]), lambda: scrape_internships(skill))
+    except Exception as e:
+        print(f"Error fetching internships for {skill}: {e}")
+        return []
+    if internship_store is not None:
+        try:
+            internship_store.save(skill, internships)
+        except sqlite3.Error as e:
+            print(f"Error saving internships: {e}")
+    return internships
+
+# Count searched skills in the store, so the crawler refreshes the popular ones first
+def record_internship_requests(skills):
+    try:
+        internship_store.record_requests(skills)
+    except sqlite3.Error as e:
+        print(f"Error recording internship searches: {e}")
+
+# Merge per-skill internship lists: one entry per link, ranked by how many of the skills it
+# came up for, then by its best position in any list
+def merge_internships(per_skill, limit=MAX_LISTINGS):
+    merged = {}  # link -> [internship, skills it came up for, best position]
+    for skill, internships in enumerate(per_skill):
+        for position, internship in enumerate(internships):
+            entry = merged.setdefault(internship['link'], [internship, set(), position])
+            entry[1].add(skill)
+            entry[2] = min(entry[2], position)
+    ranked = sorted(merged.values(), key=lambda entry: (-len(entry[1]), entry[2]))
+    return [{**internship, 'matched_skills': len(skills)} for internship, skills, _ in ranked[:limit]]
+
+# Internship searches run for a skill set: one per skill, for at most INTERNSHIP_FANOUT_SKILLS of them
+def internship_queries(skills):
+    return list(dict.fromkeys(skills))[:INTERNSHIP_FANOUT_SKILLS]
+
+# Fetch LinkedIn jobs for skill names in one search, cached by the whole skill set
+def fetch_linkedin_jobs(skills):
+    try:
+        return linkedin_cache.get(skills_key(skills), lambda: scrape_linkedin_jobs(' '.join(skills)))
     except Exception as e:
-        print(f"Error fetching internships: {e}")
+        print(f"Error fetching LinkedIn jobs: {e}")
         return []
 
-# Extract skills from resume
+# Threads for the external sources of /jobs, started on first use so none exist when the parser workers fork
+def fetch_pool():
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(JOBS_FETCH_WORKERS, thread_name_prefix='jobs-fetch')
+        return _fetch_pool
+
+# Run fn on the fetch pool, or return None without queueing it when JOBS_FETCH_QUEUE fetches are
+# outstanding; the slot is freed when the fetch finishes or is cancelled
+def submit_fetch(fn, *args):
+    if not _fetch_slots.acquire(blocking=False):
+        print(f"Fetch queue full, skipping {fn.__name__}")
+        return None
+    try:
+        future = fetch_pool().submit(fn, *args)
+    except BaseException:
+        _fetch_slots.release()
+        raise
+    future.add_done_callback(lambda _: _fetch_slots.release())
+    return future
+
+# Job suggestions, internships and LinkedIn jobs for a set of skill ids. The external searches
+# are fetched concurrently while suggestions are scored in this thread, so the page waits for
+# the slowest search instead of all of them in turn; searches not done after JOBS_FETCH_TIMEOUT
+# (or not queued because the pool is saturated) are left out, and cancelled if they haven't started.
+def gather_listings(skills):
+    names = [skill_vocabulary.name(skill) for skill in skills]
+    sources = {'internships': [submit_fetch(fetch_skill_internships, name) for name in internship_queries(names)],
+               'linkedin_jobs': [submit_fetch(fetch_linkedin_jobs, names)]}
+    if internship_store is not None:
+        submit_fetch(record_internship_requests, internship_queries(names))
+    listings = {'job_suggestions': get_job_suggestions(skills)}
+    deadline = time.monotonic() + JOBS_FETCH_TIMEOUT
+
+    def collect(name):
+        results = []
+        for future in sources[name]:
+            if future is None:
+                continue
+            try:
+                results.append(future.result(max(0.0, deadline - time.monotonic())))
+            except TimeoutError:
+                future.cancel()
+                print(f"Timed out fetching {name}")
+        return results
+
+    listings['internships'] = merge_internships(collect('internships'))
+    listings['linkedin_jobs'] = next(iter(collect('linkedin_jobs')), [])
+    return listings
+
+# Extract skills from resume as canonical skill ids ("javascript" and "JS" both count as JavaScript).
+# file is a path, the document's bytes, or a seekable binary file object such as an upload's stream;
+# PDF, DOCX and plain text are recognised by content. It is parsed in the resume parser pool; raises ParserUnavailable when it is saturated.
 def parse_resume(file):
-    skills = set()
-    with open(file, 'rb') as f:
-        reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            text = page.extract_text()
-            skills.update(re.findall(r'\b(?:Python|Java|HTML|CSS|JavaScript|Machine Learning)\b', text, re.IGNORECASE))
-    return skills
+    return skill_vocabulary.ids(resume_parser.parse(file))
+
+# Skill ids found by a parse job started in /details, waiting for it if it is still running
+def resume_job_skills(job_id):
+    return skill_vocabulary.ids(resume_parser.result(job_id))
 
 # Get job suggestions
-def get_job_suggestions(skills):
-    job_listings = load_job_listings()
-    suggestions = []
-    for _, row in job_listings.iterrows():
-        required_skills = row['Required_Skills'].split(', ')
-        if any(skill.strip() in required_skills for skill in skills):
-            suggestions.append(row['Job_Title'])
-    return suggestions[:10]
+def get_job_suggestions(skills, mode=SUGGESTION_MODE):
+    if CATALOG_BACKEND == 'sqlite':
+        return job_store.lookup(skills, limit=10, mode=mode)
+    engine = suggestion_engine(job_catalog.get(), mode)
+    return engine.lookup(skills, limit=10)
+
+# Get job suggestions for many skill sets at once, scored in one pass over the catalog
+def get_job_suggestions_batch(skill_sets, mode=SUGGESTION_MODE, limit=10):
+    if CATALOG_BACKEND == 'sqlite':
+        return job_store.lookup_batch(skill_sets, limit=limit, mode=mode)
+    engine = suggestion_engine(job_catalog.get(), mode)
+    return engine.lookup_batch(skill_sets, limit=limit)
 
 # HTML Template
 HTML_TEMPLATE = '''<!DOCTYPE html>
@@ -74,8 +229,8 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         <h1 class="text-4xl font-bold text-center text-gray-800 mb-8">Upload Your Resume</h1>
         <form action="/details" method="POST" enctype="multipart/form-data" class="space-y-6">
             <div>
-                <label class="block text-lg font-semibold text-gray-700">Upload Your Resume (PDF)</label>
-                <input type="file" name="resume" required class="w-full mt-2 p-3 border border-gray-300 rounded-lg">
+                <label class="block text-lg font-semibold text-gray-700">Upload Your Resume (PDF, DOCX or TXT)</label>
+                <input type="file" name="resume" accept=".pdf,.docx,.txt" required class="w-full mt-2 p-3 border border-gray-300 rounded-lg">
             </div>
             <button type="submit" class="w-full bg-blue-600 text-white py-3 rounded-lg shadow-lg hover:bg-blue-700 transition duration-300">Submit</button>
         </form>
@@ -124,7 +279,7 @@ JOBS_TEMPLATE = '''<!DOCTYPE html>
 <body class="bg-gradient-to-r from-blue-500 to-purple-600 min-h-screen p-4">
     <div class="container mx-auto bg-white p-8 md:p-16 shadow-2xl rounded-lg max-w-6xl">
         <h1 class="text-4xl font-bold text-center text-gray-800 mb-8">Job and Internship Opportunities</h1>
-        <div class="grid grid-cols-1 md:grid-cols-2 gap-8">
+        <div class="grid grid-cols-1 md:grid-cols-3 gap-8">
             <div>
                 <h2 class="text-2xl font-semibold text-gray-700 mb-4">Job Suggestions</h2>
                 <ul class="space-y-4">
@@ -142,12 +297,26 @@ JOBS_TEMPLATE = '''<!DOCTYPE html>
                     {% for internship in internships %}
                         <li class="bg-gray-100 p-4 rounded-lg shadow-md">
                             <span class="text-lg font-medium text-gray-700">{{ internship.title }} at {{ internship.company }}</span>
+                            {% if internship.matched_skills > 1 %}
+                                <span class="block text-sm text-gray-500">Matches {{ internship.matched_skills }} of your skills</span>
+                            {% endif %}
                             <a href="{{ internship.link }}" target="_blank" class="ml-4 bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700 transition duration-300">View</a>
                             <button onclick="fillApplication('{{ internship.title }}')" class="ml-4 bg-blue-600 text-white px-4 py-2 rounded-lg hover:bg-blue-700 transition duration-300">Apply</button>
                         </li>
                     {% endfor %}
                 </ul>
             </div>
+            <div>
+                <h2 class="text-2xl font-semibold text-gray-700 mb-4">LinkedIn Jobs</h2>
+                <ul class="space-y-4">
+                    {% for job in linkedin_jobs %}
+                        <li class="bg-gray-100 p-4 rounded-lg shadow-md">
+                            <span class="text-lg font-medium text-gray-700">{{ job.title }} at {{ job.company }}</span>
+                            <a href="{{ job.link }}" target="_blank" class="ml-4 bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700 transition duration-300">View</a>
+                        </li>
+                    {% endfor %}
+                </ul>
+            </div>
         </div>
         <form id="applyForm" action="/apply" method="POST" class="hidden">
             <input type="hidden" name="job_title" id="job_title">
@@ -172,24 +341,169 @@ def index():
 @app.route('/details', methods=['POST'])
 def details():
     resume_file = request.files['resume']
-    resume_path = os.path.join('uploads', resume_file.filename)
-    resume_file.save(resume_path)
-    session['resume_skills'] = list(parse_resume(resume_path))
-    os.remove(resume_path)
+    # Parsing carries on while the user fills in the details form
+    try:
+        session['resume_job'] = resume_parser.submit(resume_file.stream)
+        session.pop('resume_job_timeouts', None)
+    except ParserUnavailable as e:
+        return f"{e}. Please try again in a few seconds.", 503, {'Retry-After': '5'}
+    except QuarantinedDocument:
+        return "Could not read your resume. Please upload a PDF, DOCX or plain text file.", 400
+    session.pop('resume_skills', None)
     return render_template_string(DETAILS_TEMPLATE)
 
+# Forget the parse job of the last upload, once collected or given up on
+def drop_resume_job():
+    session.pop('resume_job', None)
+    session.pop('resume_job_timeouts', None)
+
 @app.route('/jobs', methods=['POST'])
 def jobs():
     session['user_details'] = request.form.to_dict()
-    skills = session.get('resume_skills', [])
-    return render_template_string(JOBS_TEMPLATE, 
-                                  job_suggestions=get_job_suggestions(skills),
-                                  internships=fetch_internships(' '.join(skills)),
-                                  user_details=session['user_details'])
+    if 'resume_job' in session:
+        try:
+            # Taxonomy skill ids, which every worker process agrees on
+            session['resume_skills'] = sorted(resume_job_skills(session['resume_job']))
+        except ParseTimeout as e:
+            session['resume_job_timeouts'] = session.get('resume_job_timeouts', 0) + 1
+            if session['resume_job_timeouts'] >= RESUME_JOB_ATTEMPTS:
+                drop_resume_job()
+                return "Your resume is taking too long to read. Please upload it again.", 409
+            return f"{e}. Please try again in a few seconds.", 503, {'Retry-After': '5'}
+        except ParserUnavailable as e:
+            return f"{e}. Please try again in a few seconds.", 503, {'Retry-After': '5'}
+        except ParseJobNotFound:
+            drop_resume_job()
+            return "Your resume upload has expired. Please upload it again.", 409
+        except Exception as e:
+            print(f"Error parsing resume: {e}")
+            drop_resume_job()
+            return "Could not read your resume. Please upload a PDF, DOCX or plain text file.", 400
+        drop_resume_job()
+    skills = sorted(skill_vocabulary.ids(session.get('resume_skills', [])))
+    return render_template_string(JOBS_TEMPLATE, **gather_listings(skills), user_details=session['user_details'])
+
+@app.route('/api/catalog', methods=['GET'])
+def catalog_status():
+    if CATALOG_BACKEND == 'sqlite':
+        return jsonify(job_store.stats())
+    return jsonify(job_catalog.stats())
+
+@app.route('/api/internship-cache', methods=['GET'])
+def internship_cache_status():
+    return jsonify({'internships': internship_cache.stats(), 'linkedin_jobs': linkedin_cache.stats()})
+
+@app.route('/api/internship-store', methods=['GET'])
+def internship_store_status():
+    if internship_store is None:
+        return jsonify(error="No internship store is configured"), 404
+    return jsonify(internship_store.stats())
+
+@app.route('/api/resume-jobs/<job_id>', methods=['GET'])
+def resume_job_status(job_id):
+    status = resume_parser.status(job_id)
+    if status is None:
+        return jsonify(error=f"No resume parse job {job_id}"), 404
+    if status != 'done':
+        return jsonify(status=status)
+    skills = resume_job_skills(job_id)
+    return jsonify(status=status, skills=sorted(map(skill_vocabulary.name, skills)))
+
+@app.route('/api/resume-cache', methods=['GET'])
+def resume_cache_status():
+    return jsonify({**resume_parser.cache.stats(), 'quarantined': len(resume_parser.quarantine)})
+
+# GET /api/jobs/search?q=data+analyst&limit=10: full-text search over the job store's titles and skills
+@app.route('/api/jobs/search', methods=['GET'])
+def search_jobs():
+    text = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    if not text.strip():
+        return jsonify(error="q is required"), 400
+    if limit < 0:
+        return jsonify(error="limit must be a non-negative integer"), 400
+    try:
+        jobs = job_store.search(text, limit)
+    except FileNotFoundError:
+        return jsonify(error="No job store; build one with `flask build-job-store`"), 404
+    return jsonify(jobs=jobs)
+
+# POST {"skill_sets": [["Python", "SQL"], ...], "limit": 10, "mode": "ranked"}
+@app.route('/api/suggestions/batch', methods=['POST'])
+def suggestions_batch():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify(error="Expected a JSON object"), 400
+    skill_sets = payload.get('skill_sets')
+    limit = payload.get('limit', 10)
+    mode = payload.get('mode', SUGGESTION_MODE)
+    if (not isinstance(skill_sets, list)
+            or not all(isinstance(skills, list) and all(isinstance(s, str) for s in skills) for skills in skill_sets)):
+        return jsonify(error="skill_sets must be a list of lists of skill names"), 400
+    if len(skill_sets) > MAX_BATCH_SIZE:
+        return jsonify(error=f"At most {MAX_BATCH_SIZE} skill sets per request"), 413
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        return jsonify(error="limit must be a non-negative integer"), 400
+    if not isinstance(mode, str):
+        return jsonify(error="mode must be a string"), 400
+    try:
+        suggestions = get_job_suggestions_batch(skill_sets, mode, limit)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(suggestions=suggestions)
 
 @app.route('/apply', methods=['POST'])
 def apply():
     return f"Application submitted for {request.form['job_title']} by {request.form['name']}!"
 
+# flask --app index compile-catalog [SOURCE] [TARGET], then point JOB_CATALOG_PATH at TARGET
+@app.cli.command('compile-catalog')
+@click.argument('source', default='./job_listings.csv')
+@click.argument('target', required=False)
+def compile_catalog_command(source, target):
+    """Compile the job listings CSV into a memory-mappable catalog file."""
+    target = compile_catalog(source, target or default_target(source))
+    click.echo(f"Compiled {source} -> {target}")
+
+# flask --app index build-job-store [SOURCE] [TARGET], then set JOB_CATALOG_BACKEND=sqlite
+@app.cli.command('build-job-store')
+@click.argument('source', default='./job_listings.csv')
+@click.argument('target', default=JOB_STORE_PATH)
+def build_job_store_command(source, target):
+    """Load the job listings CSV into the SQLite job store."""
+    click.echo(f"Built {build_job_store(source, target)} from {source}")
+
+# flask --app index ingest-resumes SOURCE [OUTPUT]; rerun the same command to resume after an interruption
+@app.cli.command('ingest-resumes')
+@click.argument('source')
+@click.argument('output', default='resumes.jsonl')
+@click.option('--workers', type=int, default=None, help='Parser processes (default: one per core).')
+def ingest_resumes_command(source, output, workers):
+    """Extract skills from a directory or tar archive of resumes (PDF, DOCX, TXT) into a JSONL file."""
+    stats = ingest(source, output, workers, echo=click.echo)
+    click.echo(f"{stats['files']} files ({stats['skipped']} already done, {stats['duplicates']} duplicates, "
+               f"{stats['failed']} failed) in {stats['seconds']:.1f} s: {stats['files_per_second']:.1f} files/s, "
+               f"{stats['mb_per_second']:.2f} MB/s, p50 {stats['p50_seconds'] * 1e3:.1f} ms, "
+               f"p99 {stats['p99_seconds'] * 1e3:.1f} ms per file")
+
+# flask --app index crawl-internships [--once]; run it as its own process next to the web workers
+@app.cli.command('crawl-internships')
+@click.option('--interval', type=float, default=INTERNSHIP_CRAWL_INTERVAL, help='Seconds before a skill is crawled again.')
+@click.option('--concurrency', type=int, default=INTERNSHIP_CRAWL_CONCURRENCY, help='Searches in flight at once.')
+@click.option('--skills', type=int, default=INTERNSHIP_CRAWL_SKILLS, help='Most skills refreshed per pass.')
+@click.option('--poll', type=float, default=INTERNSHIP_CRAWL_POLL, help='Seconds between passes.')
+@click.option('--once', is_flag=True, help='Run a single pass and exit.')
+def crawl_internships_command(interval, concurrency, skills, poll, once):
+    """Keep the internship store fresh, most requested skills first (every taxonomy skill is crawled too)."""
+    if internship_store is None:
+        raise click.ClickException("Set INTERNSHIP_STORE_PATH to crawl into a store")
+    internship_store.add_skills(name for name, _ in skill_vocabulary.taxonomy)
+    if once:
+        stats = crawl_once(internship_store, scrape_internships, interval, concurrency, skills)
+        click.echo(f"Crawled {stats['skills']} skills ({stats['listings']} listings, {stats['errors']} errors) "
+                   f"in {stats['seconds']:.1f} s")
+    else:
+        run_crawler(internship_store, scrape_internships, interval, concurrency, skills, poll, echo=click.echo)
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Seconds before a skill's stored listings are crawled again
+INTERNSHIP_CRAWL_INTERVAL = float(os.environ.get('INTERNSHIP_CRAWL_INTERVAL', '3600'))
+# Searches sent to Internshala at once
+INTERNSHIP_CRAWL_CONCURRENCY = int(os.environ.get('INTERNSHIP_CRAWL_CONCURRENCY', '4'))
+# Most skills refreshed per pass, most requested first
+INTERNSHIP_CRAWL_SKILLS = int(os.environ.get('INTERNSHIP_CRAWL_SKILLS', '500'))
+# Seconds between passes, so skills first requested by users are picked up soon
+INTERNSHIP_CRAWL_POLL = float(os.environ.get('INTERNSHIP_CRAWL_POLL', '60'))
+
+
+def crawl_once(store, scrape, interval=INTERNSHIP_CRAWL_INTERVAL, concurrency=INTERNSHIP_CRAWL_CONCURRENCY,
+               limit=INTERNSHIP_CRAWL_SKILLS):
+    """Scrape every due skill in the store and save its listings; returns the pass's stats."""
+    started = time.time()
+    skills = store.due(limit, interval)
+    stats = {'skills': len(skills), 'listings': 0, 'errors': 0}
+
+    def crawl(skill):
+        try:
+            return skill, scrape(skill), None
+        except Exception as e:
+            return skill, None, f'{type(e).__name__}: {e}'
+
+    with ThreadPoolExecutor(max(concurrency, 1), thread_name_prefix='internship-crawl') as pool:
+        for skill, internships, error in pool.map(crawl, skills):
+            # Written from this thread only, one short transaction per skill
+            if error is None:
+                store.save(skill, internships)
+                stats['listings'] += len(internships)
+            else:
+                store.save_error(skill, error)
+                stats['errors'] += 1
+    stats['seconds'] = time.time() - started
+    store.log_crawl(started, stats['seconds'], stats['skills'], stats['listings'], stats['errors'])
+    return stats
+
+
+def run(store, scrape, interval=INTERNSHIP_CRAWL_INTERVAL, concurrency=INTERNSHIP_CRAWL_CONCURRENCY,
+        limit=INTERNSHIP_CRAWL_SKILLS, poll=INTERNSHIP_CRAWL_POLL, echo=print):
+    """Crawl forever: a pass every `poll` seconds refreshes skills whose listings are older than `interval`."""
+    while True:
+        stats = crawl_once(store, scrape, interval, concurrency, limit)
+        if stats['skills']:
+            echo(f"Crawled {stats['skills']} skills ({stats['listings']} listings, {stats['errors']} errors) "
+                 f"in {stats['seconds']:.1f} s")
+        time.sleep(poll)
@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import threading
+import time
+
+from listing_cache import skills_key
+
+# Internship listings crawled per skill (e.g. ./internships.db); empty serves every search live from Internshala
+INTERNSHIP_STORE_PATH = os.environ.get('INTERNSHIP_STORE_PATH', '')
+# Seconds stored listings are served; older ones are searched live again, so a stopped crawler can't pin them
+INTERNSHIP_STORE_MAX_AGE = float(os.environ.get('INTERNSHIP_STORE_MAX_AGE', '7200'))
+# Seconds before a skill whose search failed is crawled again, doubling with each failure in a row up to the max
+INTERNSHIP_RETRY_SECONDS = float(os.environ.get('INTERNSHIP_RETRY_SECONDS', '300'))
+INTERNSHIP_RETRY_MAX_SECONDS = float(os.environ.get('INTERNSHIP_RETRY_MAX_SECONDS', '86400'))
+# Crawl runs remembered for stats
+CRAWL_LOG_RUNS = 100
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS skill (
+    skill TEXT PRIMARY KEY, requests INTEGER NOT NULL DEFAULT 0, last_requested REAL,
+    crawled_at REAL, error TEXT, failures INTEGER NOT NULL DEFAULT 0, retry_at REAL) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skill_demand ON skill (requests DESC);
+CREATE TABLE IF NOT EXISTS internship (
+    skill TEXT NOT NULL, position INTEGER NOT NULL, title TEXT, company TEXT, link TEXT,
+    PRIMARY KEY (skill, position)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS crawl_log (
+    id INTEGER PRIMARY KEY, started REAL, seconds REAL, skills INTEGER, listings INTEGER, errors INTEGER);
+'''
+
+
+class InternshipStore:
+    """Internship listings per skill, written by the crawler and read by the web workers.
+
+    Skills are keyed by skills_key(), like the live cache; a single skill's key is its
+    normalized name, which the crawler also sends as the search. The database runs in WAL
+    mode so readers never wait for a crawl in progress; each thread has its own connection.
+    """
+
+    def __init__(self, path=INTERNSHIP_STORE_PATH, max_age=INTERNSHIP_STORE_MAX_AGE, retry=INTERNSHIP_RETRY_SECONDS,
+                 max_retry=INTERNSHIP_RETRY_MAX_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        self.retry = retry
+        self.max_retry = max_retry
+        self._local = threading.local()
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.db = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            local.db.execute('PRAGMA journal_mode = WAL')
+            local.db.execute('PRAGMA synchronous = NORMAL')
+            local.db.executescript(SCHEMA)
+            columns = {name for _, name, *_ in local.db.execute('PRAGMA table_info(skill)')}
+            # Stores created before failed searches were backed off
+            if 'failures' not in columns:
+                local.db.executescript('''
+                    ALTER TABLE skill ADD COLUMN failures INTEGER NOT NULL DEFAULT 0;
+                    ALTER TABLE skill ADD COLUMN retry_at REAL;''')
+            local.pid = os.getpid()
+        return local.db
+
+    def lookup(self, skill):
+        """Stored internships for a skill, or None if it has never been crawled or not within max_age seconds."""
+        db = self._connection()
+        key = skills_key([skill])
+        if db.execute('SELECT 1 FROM skill WHERE skill = ? AND crawled_at >= ?',
+                      (key, time.time() - self.max_age)).fetchone() is None:
+            return None
+        rows = db.execute('SELECT title, company, link FROM internship WHERE skill = ? ORDER BY position', (key,))
+        return [{'title': title, 'company': company, 'link': link} for title, company, link in rows]
+
+    def record_requests(self, skills):
+        """Count a search for each skill, so the crawler refreshes the most requested first."""
+        now = time.time()
+        db = self._connection()
+        with db:
+            db.execute('BEGIN')
+            db.executemany('''
+                INSERT INTO skill (skill, requests, last_requested) VALUES (?, 1, ?)
+                ON CONFLICT (skill) DO UPDATE SET requests = requests + 1, last_requested = excluded.last_requested''',
+                [(skills_key([skill]), now) for skill in set(skills)])
+
+    def add_skills(self, skills):
+        """Make skills known to the crawler without counting a request."""
+        db = self._connection()
+        with db:
+            db.execute('BEGIN')
+            db.executemany('INSERT OR IGNORE INTO skill (skill) VALUES (?)',
+                           [(skills_key([skill]),) for skill in skills])
+
+    def due(self, limit, max_age):
+        """Up to `limit` skills never crawled or crawled more than `max_age` seconds ago, most requested first.
+
+        Skills whose last search failed are left out until their retry time.
+        """
+        now = time.time()
+        rows = self._connection().execute('''
+            SELECT skill FROM skill WHERE (crawled_at IS NULL OR crawled_at < ?) AND (retry_at IS NULL OR retry_at <= ?)
+            ORDER BY requests DESC, crawled_at IS NOT NULL, crawled_at LIMIT ?''', (now - max_age, now, limit))
+        return [skill for (skill,) in rows]
+
+    def save(self, skill, internships):
+        key = skills_key([skill])
+        db = self._connection()
+        with db:
+            db.execute('BEGIN IMMEDIATE')
+            db.execute('DELETE FROM internship WHERE skill = ?', (key,))
+            db.executemany('INSERT INTO internship VALUES (?, ?, ?, ?, ?)',
+                           [(key, position, internship['title'], internship['company'], internship['link'])
+                            for position, internship in enumerate(internships)])
+            db.execute('''
+                INSERT INTO skill (skill, crawled_at) VALUES (?, ?)
+                ON CONFLICT (skill) DO UPDATE SET
+                    crawled_at = excluded.crawled_at, error = NULL, failures = 0, retry_at = NULL''', (key, time.time()))
+
+    def save_error(self, skill, error):
+        """Record a failed search; the skill is retried after `retry` seconds, doubled for each failure in a row."""
+        db = self._connection()
+        with db:
+            db.execute('BEGIN')
+            db.execute('''
+                INSERT INTO skill (skill, error, failures, retry_at) VALUES (:skill, :error, 1, :now + :retry)
+                ON CONFLICT (skill) DO UPDATE SET
+                    error = excluded.error, failures = failures + 1,
+                    retry_at = :now + MIN(:max_retry, :retry * (1 << MIN(failures, 30)))''',
+                {'skill': skills_key([skill]), 'error': error, 'now': time.time(), 'retry': self.retry,
+                 'max_retry': self.max_retry})
+
+    def log_crawl(self, started, seconds, skills, listings, errors):
+        db = self._connection()
+        with db:
+            db.execute('BEGIN')
+            db.execute('INSERT INTO crawl_log (started, seconds, skills, listings, errors) VALUES (?, ?, ?, ?, ?)',
+                       (started, seconds, skills, listings, errors))
+            db.execute('DELETE FROM crawl_log WHERE id <= (SELECT MAX(id) FROM crawl_log) - ?', (CRAWL_LOG_RUNS,))
+
+    def stats(self):
+        db = self._connection()
+        skills, crawled, failing, oldest = db.execute('''
+            SELECT COUNT(*), COUNT(crawled_at), COUNT(error), MIN(crawled_at) FROM skill''').fetchone()
+        (listings,) = db.execute('SELECT COUNT(*) FROM internship').fetchone()
+        last = db.execute('SELECT started, seconds, skills, listings, errors FROM crawl_log ORDER BY id DESC LIMIT 1')
+        last = last.fetchone()
+        return {
+            'path': self.path, 'skills': skills, 'crawled_skills': crawled, 'failing_skills': failing,
+            'listings': listings, 'oldest_crawl_age': time.time() - oldest if oldest is not None else None,
+            'last_crawl': dict(zip(('started', 'seconds', 'skills', 'listings', 'errors'), last)) if last else None,
+        }
@@ -0,0 +1,126 @@
+import csv
+import os
+import sqlite3
+import threading
+
+from skill_index import split_skills
+from skill_vocabulary import skill_vocabulary
+
+JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH', './job_listings.db')
+
+SCHEMA = '''
+CREATE TABLE jobs (id INTEGER PRIMARY KEY, title TEXT, required_skills TEXT);
+CREATE TABLE job_skill (skill TEXT NOT NULL, job_id INTEGER NOT NULL, PRIMARY KEY (skill, job_id)) WITHOUT ROWID;
+CREATE VIRTUAL TABLE job_fts USING fts5(title, required_skills, content='jobs', content_rowid='id');
+'''
+
+# job_skill.skill holds SkillVocabulary.normalized() names, which every process agrees on.
+# Job ids are CSV row numbers, so ordering by id is file order like the in-memory engines
+QUERIES = {
+    'filter': '''
+        SELECT jobs.title FROM jobs
+        WHERE jobs.id IN (SELECT DISTINCT job_id FROM job_skill WHERE skill IN ({skills}) ORDER BY job_id LIMIT ?)
+        ORDER BY jobs.id''',
+    'ranked': '''
+        SELECT jobs.title FROM (
+            SELECT job_id, COUNT(*) AS score FROM job_skill WHERE skill IN ({skills})
+            GROUP BY job_id ORDER BY score DESC, job_id LIMIT ?
+        ) AS matches JOIN jobs ON jobs.id = matches.job_id
+        ORDER BY matches.score DESC, matches.job_id''',
+}
+
+BATCH_SIZE = 10_000
+
+
+def check_mode(mode):
+    """Raise ValueError for a suggestion mode the SQLite store can't serve."""
+    if mode not in QUERIES:
+        raise ValueError(f"Suggestion mode {mode!r} is not supported by the SQLite store; "
+                         f"expected one of {sorted(QUERIES)}")
+
+
+def build_job_store(source, target=JOB_STORE_PATH):
+    """Load a job listings CSV into a new SQLite store, streaming it row by row."""
+    tmp = f'{target}.tmp.{os.getpid()}'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp)
+    try:
+        db.execute('PRAGMA journal_mode = OFF')
+        db.execute('PRAGMA synchronous = OFF')
+        db.executescript(SCHEMA)
+        with open(source, newline='', encoding='utf-8') as f:
+            jobs, job_skills = [], []
+            for job_id, row in enumerate(csv.DictReader(f)):
+                required = row['Required_Skills']
+                jobs.append((job_id, row['Job_Title'], required))
+                skills = dict.fromkeys(map(skill_vocabulary.normalized, split_skills(required or None)))
+                job_skills.extend((skill, job_id) for skill in skills)
+                if len(jobs) >= BATCH_SIZE:
+                    _insert(db, jobs, job_skills)
+                    jobs, job_skills = [], []
+            _insert(db, jobs, job_skills)
+        db.execute("INSERT INTO job_fts(job_fts) VALUES ('rebuild')")
+        db.commit()
+        db.execute('ANALYZE')
+    finally:
+        db.close()
+    # Readers keep their open connection to the old file until they notice the swap
+    os.replace(tmp, target)
+    return target
+
+
+def _insert(db, jobs, job_skills):
+    db.executemany('INSERT INTO jobs VALUES (?, ?, ?)', jobs)
+    db.executemany('INSERT INTO job_skill VALUES (?, ?)', job_skills)
+
+
+class SqliteJobStore:
+    """Job catalog backend that answers suggestions with indexed SQLite queries.
+
+    The database is opened read-only, one connection per thread, and reopened when
+    the file is replaced; every worker process shares the same file and page cache.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        st = os.stat(self.path)
+        stamp = (st.st_ino, st.st_mtime_ns)
+        local = self._local
+        if getattr(local, 'stamp', None) != stamp:
+            if getattr(local, 'db', None) is not None:
+                local.db.close()
+            local.db = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            local.stamp = stamp
+        return local.db
+
+    def lookup(self, skills, limit=10, mode='ranked'):
+        check_mode(mode)
+        query = QUERIES[mode]
+        wanted = sorted({skill_vocabulary.normalized(skill) for skill in skills} - {None})
+        if not wanted:
+            return []
+        sql = query.format(skills=', '.join('?' * len(wanted)))
+        return [title for (title,) in self._connection().execute(sql, (*wanted, limit))]
+
+    def lookup_batch(self, skill_sets, limit=10, mode='ranked'):
+        return [self.lookup(skills, limit, mode) for skills in skill_sets]
+
+    def search(self, text, limit=10):
+        """Full-text search over job titles and required skills, best matches first.
+
+        Every word of `text` must match; words are quoted, so FTS5 query syntax in them is searched literally.
+        """
+        words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+        if not words:
+            return []
+        rows = self._connection().execute(
+            'SELECT title FROM job_fts WHERE job_fts MATCH ? ORDER BY rank LIMIT ?', (' '.join(words), limit))
+        return [title for (title,) in rows]
+
+    def stats(self):
+        (rows,) = self._connection().execute('SELECT COUNT(*) FROM jobs').fetchone()
+        return {'path': self.path, 'rows': rows}
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from skill_vocabulary import skill_vocabulary
+
+# Seconds scraped listings are served as fresh
+INTERNSHIP_CACHE_TTL = float(os.environ.get('INTERNSHIP_CACHE_TTL', '600'))
+# Seconds past the TTL they are still served while a background refresh runs
+INTERNSHIP_CACHE_STALE = float(os.environ.get('INTERNSHIP_CACHE_STALE', '3600'))
+# Queries remembered; the least recently used are dropped past this
+INTERNSHIP_CACHE_ENTRIES = int(os.environ.get('INTERNSHIP_CACHE_ENTRIES', '1024'))
+# Threads refreshing stale entries in the background
+INTERNSHIP_CACHE_REFRESHERS = int(os.environ.get('INTERNSHIP_CACHE_REFRESHERS', '2'))
+
+
+def skills_key(skills):
+    """Cache key for a search over skills: their normalized names, sorted, so order, case and aliases don't matter.
+
+    Only a key; searches are sent upstream with the skills as written.
+    """
+    return '|'.join(sorted({skill_vocabulary.normalized(skill) for skill in skills} - {None}))
+
+
+class ListingCache:
+    """TTL cache with stale-while-revalidate for results fetched from a slow upstream.
+
+    get(key, fetch) returns a fresh entry at once; a stale one (within `stale` seconds
+    past the TTL) is also returned at once while fetch() refreshes it on a background
+    thread. Only a missing or expired entry makes the caller wait, and concurrent
+    callers for the same key share one fetch. A fetch that raises is not cached: the
+    caller gets the exception, a background refresh keeps the stale entry.
+    """
+
+    def __init__(self, ttl=INTERNSHIP_CACHE_TTL, stale=INTERNSHIP_CACHE_STALE, entries=INTERNSHIP_CACHE_ENTRIES,
+                 refreshers=INTERNSHIP_CACHE_REFRESHERS):
+        self.ttl = ttl
+        self.stale = stale
+        self.entries = entries
+        self.refreshers = refreshers
+        self._values = OrderedDict()  # key -> (fetched at, value)
+        self._fetches = {}  # key -> Future of the fetch in progress
+        self._lock = threading.Lock()
+        self._executor = None  # Started on the first refresh, after any worker processes have forked
+        self.counters = Counter()
+
+    def get(self, key, fetch):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None:
+                fetched, value = entry
+                age = now - fetched
+                if age < self.ttl + self.stale:
+                    self._values.move_to_end(key)
+                    if age < self.ttl:
+                        self.counters['hits'] += 1
+                    else:
+                        self.counters['stale_hits'] += 1
+                        self._refresh(key, fetch)
+                    return value
+            future = self._fetches.get(key)
+            owner = future is None
+            if owner:
+                self.counters['misses'] += 1
+                future = self._fetches[key] = Future()
+            else:
+                self.counters['coalesced'] += 1
+        if owner:
+            self._fetch(key, fetch, future)
+        return future.result()
+
+    def _refresh(self, key, fetch):
+        # Called with the lock held; at most one fetch per key is in flight
+        if key in self._fetches:
+            return
+        future = self._fetches[key] = Future()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.refreshers, thread_name_prefix='listing-refresh')
+        self.counters['refreshes'] += 1
+        self._executor.submit(self._fetch, key, fetch, future)
+
+    def _fetch(self, key, fetch, future):
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self.counters['fetch_errors'] += 1
+                del self._fetches[key]
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.entries:
+                self._values.popitem(last=False)
+                self.counters['evictions'] += 1
+            del self._fetches[key]
+        future.set_result(value)
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            fresh = sum(now - fetched < self.ttl for fetched, _ in self._values.values())
+            return {'entries': len(self._values), 'fresh': fresh, 'fetching': len(self._fetches),
+                    **self.counters}
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Parsed resumes kept in each process
+RESUME_CACHE_ENTRIES = int(os.environ.get('RESUME_CACHE_ENTRIES', '1024'))
+# Directory shared by every worker process for parsed resumes (empty keeps the cache in memory only).
+# Parse jobs started by one web worker are collected through it by the others.
+RESUME_CACHE_DIR = os.environ.get('RESUME_CACHE_DIR', './resume_cache')
+# The least recently used entries are deleted once the directory grows past this
+RESUME_CACHE_MAX_BYTES = int(os.environ.get('RESUME_CACHE_MAX_BYTES', 64 << 20))
+# Extracted text of single PDF pages, so an edited resume only re-extracts the pages that changed.
+# Pages are extracted in the parser workers, so the directory is what lets a re-upload to any of them hit.
+RESUME_PAGE_CACHE_ENTRIES = int(os.environ.get('RESUME_PAGE_CACHE_ENTRIES', '2048'))
+RESUME_PAGE_CACHE_DIR = os.environ.get('RESUME_PAGE_CACHE_DIR', './resume_page_cache')
+RESUME_PAGE_CACHE_MAX_BYTES = int(os.environ.get('RESUME_PAGE_CACHE_MAX_BYTES', 256 << 20))
+
+
+def content_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """Parse results addressed by the SHA-256 of the uploaded file's bytes.
+
+    An in-process LRU sits in front of an optional directory of JSON files that every
+    worker can read. Entries record a fingerprint of the extractor and its settings, so
+    changing the taxonomy or the budgets turns them into misses instead of stale hits.
+    With `max_age`, entries older than that many seconds are misses too.
+    """
+
+    # JSON field of a disk entry that holds the value
+    field = 'skills'
+
+    @staticmethod
+    def _load(value):
+        return Counter(value)  # A copy the caller is free to change
+
+    @staticmethod
+    def _store(value):
+        return dict(value)
+
+    def __init__(self, fingerprint, entries=RESUME_CACHE_ENTRIES, directory=RESUME_CACHE_DIR,
+                 max_bytes=RESUME_CACHE_MAX_BYTES, max_age=None):
+        self.fingerprint = fingerprint
+        self.entries = entries
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._memory = OrderedDict()  # key -> (time stored, value)
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # Estimate; recounted from the directory before evicting
+        self.counters = Counter()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def get(self, key, record=True):
+        """Cached skills for a content key, or None; record=False leaves the hit/miss counters alone."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._fresh(entry[0]):
+                self._memory.move_to_end(key)
+                self.counters['hits'] += record
+                return self._load(entry[1])
+        entry = self._read(key) if self.directory else None
+        with self._lock:
+            if entry is None:
+                self.counters['misses'] += record
+                return None
+            self.counters['disk_hits'] += record
+            self._remember(key, *entry)
+        return self._load(entry[1])
+
+    def put(self, key, skills):
+        skills = self._store(skills)
+        stored = time.time()
+        with self._lock:
+            self._remember(key, stored, skills)
+            self.counters['stores'] += 1
+        if self.directory:
+            self._write(key, stored, skills)
+
+    def _fresh(self, stored):
+        return self.max_age is None or time.time() - stored < self.max_age
+
+    def _remember(self, key, stored, skills):
+        self._memory[key] = (stored, skills)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.entries:
+            self._memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('fingerprint') != self.fingerprint or not self._fresh(entry.get('stored', 0)):
+            return None
+        try:
+            os.utime(path)  # Recently used, for eviction
+        except OSError:
+            pass
+        value = entry.get(self.field)
+        return None if value is None else (entry.get('stored', 0), value)
+
+    def _write(self, key, stored, skills):
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'w') as f:
+                json.dump({'fingerprint': self.fingerprint, 'stored': stored, self.field: skills}, f)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Error writing resume cache entry: {e}")
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            over = self._disk_bytes is None or self._disk_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until the directory is under 90% of max_bytes."""
+        files = []
+        for entry in os.scandir(self.directory):
+            # Only the two-character shard directories hold entries
+            if len(entry.name) == 2 and entry.is_dir():
+                for file in os.scandir(entry.path):
+                    try:
+                        st = file.stat()
+                    except FileNotFoundError:
+                        continue  # Evicted by another process
+                    files.append((st.st_mtime, st.st_size, file.path))
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        if total > self.max_bytes:
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.counters['disk_evictions'] += evicted
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._memory), 'disk_bytes': self._disk_bytes, **self.counters}
+
+
+class PageTextCache(ParseCache):
+    """Extracted text of single document pages, addressed by a hash of what the page draws.
+
+    Keys are built by the text extractors from a page's content streams and resources,
+    so the same page inside a different (edited) file is still a hit.
+    """
+
+    field = 'text'
+    _load = _store = staticmethod(str)
+
+    def __init__(self, fingerprint, entries=RESUME_PAGE_CACHE_ENTRIES, directory=RESUME_PAGE_CACHE_DIR,
+                 max_bytes=RESUME_PAGE_CACHE_MAX_BYTES):
+        super().__init__(fingerprint, entries, directory, max_bytes)
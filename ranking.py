@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from skill_index import RowTitles, SkillIndex, split_skills
+from skill_vocabulary import skill_vocabulary
+
+
+# Upper bound on job x query score entries materialized per block of a batch
+BATCH_BLOCK_ENTRIES = 4_000_000
+
+
+def top_entries(rows, values, k):
+    """The k rows with the best values, best first; rows must be ascending so ties keep file order."""
+    if k <= 0:
+        return rows[:0]
+    if len(values) > k:
+        threshold = values[np.argpartition(-values, k - 1)[:k]].min()
+        above = np.flatnonzero(values > threshold)
+        # argpartition breaks ties arbitrarily, so fill up with the earliest rows at the cut-off value
+        tied = np.flatnonzero(values == threshold)[:k - len(above)]
+        keep = np.concatenate([above, tied])
+        rows, values = rows[keep], values[keep]
+    return rows[np.lexsort((rows, -values))]
+
+
+def top_k(scores, k):
+    """Row ids of the k best positive scores, best first; ties keep file order."""
+    candidates = np.flatnonzero(scores > 0)
+    return top_entries(candidates, scores[candidates], k)
+
+
+def incidence_matrix(skill_lists, vocabulary):
+    """Binary row x skill CSR matrix; vocabulary maps skill id -> column, unseen skills become new columns."""
+    indices = []
+    indptr = [0]
+    for skills in skill_lists:
+        for skill_id in skill_vocabulary.intern_all(skills):
+            indices.append(vocabulary.setdefault(skill_id, len(vocabulary)))
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32),
+         np.asarray(indices, dtype=np.int32),
+         np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary)))
+
+
+class SparseRanker:
+    """Job x skill incidence matrix that ranks every job for a resume in one matrix-vector product.
+
+    A job's score is the number of the resume's skills it requires. Rows added by a
+    catalog delta live in a second, small matrix; removed rows are scored as zero.
+    """
+
+    def __init__(self, titles, vocabulary, matrix, delta_matrix=None, removed=None, shared=None):
+        self.titles = titles
+        self.vocabulary = vocabulary
+        self.matrix = matrix
+        self.delta_matrix = delta_matrix
+        self.removed = removed
+        # State tied to the base matrix, kept when a delta is applied
+        self._shared = {} if shared is None else shared
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        vocabulary = {}
+        skill_lists = (split_skills(required) for required in jobs['Required_Skills'].tolist())
+        matrix = incidence_matrix(skill_lists, vocabulary)
+        return cls(jobs['Job_Title'].tolist(), vocabulary, matrix)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        if isinstance(snapshot.jobs, pd.DataFrame):
+            return cls.from_jobs(snapshot.jobs)
+        return snapshot.jobs.sparse_ranker()  # Compiled catalogs map their arrays straight from disk
+
+    def with_delta(self, delta):
+        """This ranker with a CatalogDelta applied, in time proportional to the delta."""
+        vocabulary = dict(self.vocabulary)
+        delta_matrix = incidence_matrix(delta.skill_lists, vocabulary)
+        removed = np.fromiter(delta.removed, dtype=np.int64, count=len(delta.removed))
+        return SparseRanker(RowTitles(self.titles, delta.titles), vocabulary, self.matrix, delta_matrix, removed,
+                            self._shared)
+
+    def query_vector(self, skills):
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        columns = [self.vocabulary[i] for i in skill_vocabulary.ids(skills) if i in self.vocabulary]
+        vector[columns] = 1
+        return vector
+
+    def scores(self, skills):
+        vector = self.query_vector(skills)
+        scores = self.matrix @ vector[:self.matrix.shape[1]]
+        if self.delta_matrix is not None:
+            scores = np.concatenate([scores, self.delta_matrix @ vector[:self.delta_matrix.shape[1]]])
+        if self.removed is not None and len(self.removed):
+            scores[self.removed] = 0
+        return scores
+
+    def top_rows(self, skills, k=10):
+        return top_k(self.scores(skills), k)
+
+    def lookup(self, skills, limit=10):
+        return [self.titles[row_id] for row_id in self.top_rows(skills, limit)]
+
+    def query_matrix(self, skill_sets):
+        """One row per skill set, weighted the way query_vector weights a single one."""
+        indices = []
+        indptr = [0]
+        for skills in skill_sets:
+            wanted = skill_vocabulary.ids(skills)
+            indices.extend(sorted(self.vocabulary[i] for i in wanted if i in self.vocabulary))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(indptr) - 1, len(self.vocabulary)))
+
+    def _by_skill(self):
+        """Skill x job transposes of the base and delta matrices: one posting list per skill."""
+        by_skill = self._shared.get('by_skill')
+        if by_skill is None:
+            by_skill = self._shared['by_skill'] = self.matrix.T.tocsr()
+        if self.delta_matrix is None:
+            return [by_skill]
+        if getattr(self, '_delta_by_skill', None) is None:
+            self._delta_by_skill = self.delta_matrix.T.tocsr()
+        return [by_skill, self._delta_by_skill]
+
+    def top_rows_batch(self, skill_sets, k=10):
+        """top_rows for many skill sets, scored together by walking each skill's posting list.
+
+        Query blocks are multiplied with the skill x job transpose, which only touches jobs
+        that share a skill with some query in the block.
+        """
+        queries = self.query_matrix(skill_sets)
+        parts = self._by_skill()
+        # Candidate entries a query can produce: the summed posting list lengths of its skills
+        frequency = np.zeros(queries.shape[1])
+        for part in parts:
+            frequency[:part.shape[0]] += np.diff(part.indptr)
+        binary = sparse.csr_matrix((np.ones_like(queries.data), queries.indices, queries.indptr), shape=queries.shape)
+        bounds = np.cumsum(binary @ frequency)
+
+        results = []
+        start = 0
+        while start < len(skill_sets):
+            block_bound = bounds[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(bounds, block_bound + BATCH_BLOCK_ENTRIES, side='right')))
+            block = queries[start:stop]
+            scores = sparse.hstack([block[:, :part.shape[0]] @ part for part in parts], format='csr')
+            scores.sort_indices()
+            for row in range(scores.shape[0]):
+                begin, end = scores.indptr[row], scores.indptr[row + 1]
+                rows, values = scores.indices[begin:end], scores.data[begin:end]
+                if self.removed is not None and len(self.removed):
+                    live = ~np.isin(rows, self.removed)
+                    rows, values = rows[live], values[live]
+                results.append(top_entries(rows, values, k))
+            start = stop
+        return results
+
+    def lookup_batch(self, skill_sets, limit=10):
+        return [[self.titles[row_id] for row_id in rows] for rows in self.top_rows_batch(skill_sets, limit)]
+
+
+def smooth_idf(document_frequency, documents):
+    return (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+def _normalized(matrix, idf):
+    """IDF-weighted copy of a binary CSR matrix with every non-empty row scaled to unit length."""
+    data = idf[matrix.indices]
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    norms = np.sqrt(np.bincount(rows, weights=data.astype(np.float64) ** 2, minlength=matrix.shape[0]))
+    data /= norms[rows].astype(np.float32)
+    return sparse.csr_matrix((data, matrix.indices, matrix.indptr), shape=matrix.shape)
+
+
+class TfidfRanker(SparseRanker):
+    """Ranks jobs by cosine similarity between IDF-weighted skill vectors.
+
+    A skill that half the catalog asks for counts for less than a rare one. Job
+    vectors are normalized at build time, so a request is still one matrix-vector
+    product. Rows added by a delta are weighted with the base catalog's IDF until
+    the next compaction rebuilds it.
+    """
+
+    def __init__(self, titles, vocabulary, matrix, idf, delta_matrix=None, removed=None, shared=None):
+        super().__init__(titles, vocabulary, matrix, delta_matrix, removed, shared)
+        self.idf = idf
+
+    @classmethod
+    def from_binary(cls, ranker):
+        jobs, skills = ranker.matrix.shape
+        idf = smooth_idf(np.bincount(ranker.matrix.indices, minlength=skills), jobs)
+        return cls(ranker.titles, ranker.vocabulary, _normalized(ranker.matrix, idf), idf)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls.from_binary(snapshot.derive('sparse_ranker', SparseRanker.from_snapshot))
+
+    def with_delta(self, delta):
+        binary = SparseRanker.with_delta(self, delta)
+        new_columns = np.bincount(binary.delta_matrix.indices, minlength=len(binary.vocabulary))[len(self.idf):]
+        idf = np.concatenate([self.idf, smooth_idf(new_columns, self.matrix.shape[0])])
+        return TfidfRanker(binary.titles, binary.vocabulary, self.matrix, idf,
+                           _normalized(binary.delta_matrix, idf), binary.removed, self._shared)
+
+    def query_vector(self, skills):
+        vector = super().query_vector(skills) * self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def query_matrix(self, skill_sets):
+        return _normalized(super().query_matrix(skill_sets), self.idf)
+
+
+# mode -> (derived structure name, builder); every engine exposes lookup(skills, limit)
+SUGGESTION_ENGINES = {
+    'filter': ('skill_index', SkillIndex.from_snapshot),
+    'ranked': ('sparse_ranker', SparseRanker.from_snapshot),
+    'tfidf': ('tfidf_ranker', TfidfRanker.from_snapshot),
+}
+
+
+def suggestion_engine(snapshot, mode):
+    try:
+        name, build = SUGGESTION_ENGINES[mode]
+    except KeyError:
+        raise ValueError(f"Unknown suggestion mode {mode!r}; expected one of {sorted(SUGGESTION_ENGINES)}")
+    return snapshot.derive(name, build)
@@ -0,0 +1,143 @@
+import json
+import multiprocessing
+import os
+import tarfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from parse_cache import content_key
+from resume_parser import guarded_extract, limit_worker
+
+RESUME_SUFFIXES = ('.pdf', '.docx', '.txt')
+
+
+def iter_resume_files(source):
+    """(path, bytes) of every resume in a directory tree or a tar archive, in a stable order."""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_SUFFIXES):
+                    path = os.path.join(root, name)
+                    with open(path, 'rb') as f:
+                        yield path, f.read()
+        return
+    # Streamed member by member, so compressed archives don't have to fit in memory
+    with tarfile.open(source, 'r|*') as archive:
+        for member in archive:
+            if member.isfile() and member.name.lower().endswith(RESUME_SUFFIXES):
+                yield f'{source}:{member.name}', archive.extractfile(member).read()
+
+
+def read_done(output):
+    """Paths already written to a JSONL output, after dropping a line cut off by an interruption."""
+    done = set()
+    try:
+        with open(output, 'rb+') as f:
+            data = f.read()
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                f.truncate(end)
+    except FileNotFoundError:
+        return done
+    for line in data[:end].splitlines():
+        try:
+            done.add(json.loads(line)['path'])
+        except (ValueError, KeyError):
+            continue
+    return done
+
+
+def _parse_file(data):
+    started = time.perf_counter()
+    try:
+        skills, exhausted = guarded_extract(data)
+        return dict(skills), exhausted, None, time.perf_counter() - started
+    except Exception as e:
+        return None, None, f'{type(e).__name__}: {e}', time.perf_counter() - started
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def ingest(source, output, workers=None, echo=print, report_every=1000):
+    """Extract skills from every resume under `source` into `output` as JSON lines, on all cores.
+
+    Each line is {"path", "sha256", "skills"} ({"error"} instead of skills for files
+    that failed, plus "truncated" when an extraction budget ran out). Files already
+    in `output` are skipped, so an interrupted run picks up where it stopped. Files
+    with the same content are parsed once. Workers run under the same memory, CPU
+    and structural limits as the upload parser.
+    """
+    workers = workers or os.cpu_count() or 1
+    done = read_done(output)
+    seen = {}  # sha256 -> line fields of a file parsed in this run
+    timings = []
+    stats = {'files': 0, 'skipped': len(done), 'failed': 0, 'duplicates': 0, 'bytes': 0}
+    started = time.perf_counter()
+    with open(output, 'a', encoding='utf-8') as out, \
+            ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'),
+                                initializer=limit_worker) as pool:
+
+        def write(path, key, fields):
+            out.write(json.dumps({'path': path, 'sha256': key, **fields}) + '\n')
+            out.flush()
+            stats['files'] += 1
+            stats['failed'] += 'error' in fields
+            if stats['files'] % report_every == 0:
+                echo(_progress(stats, time.perf_counter() - started))
+
+        def collect(finished):
+            for future in finished:
+                path, key = pending.pop(future)
+                skills, exhausted, error, seconds = future.result()
+                timings.append(seconds)
+                fields = {'error': error} if error else {'skills': skills}
+                if exhausted:
+                    fields['truncated'] = exhausted
+                seen[key] = fields
+                write(path, key, fields)
+                for twin in waiting.pop(key, ()):
+                    stats['duplicates'] += 1
+                    write(twin, key, fields)
+
+        pending = {}  # future -> (path, sha256)
+        waiting = {}  # sha256 -> paths of duplicates of a file still being parsed
+        for path, data in iter_resume_files(source):
+            if path in done:
+                continue
+            stats['bytes'] += len(data)
+            key = content_key(data)
+            if key in seen:
+                stats['duplicates'] += 1
+                write(path, key, seen[key])
+                continue
+            if key in waiting:
+                waiting[key].append(path)
+                continue
+            waiting[key] = []
+            pending[pool.submit(_parse_file, data)] = (path, key)
+            # Bounded in flight, so a huge archive is never read into memory ahead of the workers
+            if len(pending) >= 4 * workers:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        while pending:
+            collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    stats.update({
+        'seconds': elapsed,
+        'files_per_second': stats['files'] / elapsed if elapsed else 0.0,
+        'mb_per_second': stats['bytes'] / elapsed / 1e6 if elapsed else 0.0,
+        'p50_seconds': _percentile(timings, 0.50),
+        'p99_seconds': _percentile(timings, 0.99),
+    })
+    return stats
+
+
+def _progress(stats, elapsed):
+    return (f"{stats['files']} files, {stats['failed']} failed, "
+            f"{stats['files'] / elapsed:.1f} files/s" if elapsed else f"{stats['files']} files")
@@ -0,0 +1,439 @@
+import itertools
+import multiprocessing
+import os
+import resource
+import signal
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from document_guard import Quarantine, RejectedDocument, check_document
+from parse_cache import ParseCache, content_key
+from skill_extractor import skill_extractor
+from text_extractors import RESUME_PDF_BACKEND, UnsupportedDocument, page_texts
+
+# Worker processes for PDF text extraction (0 parses in the calling thread)
+RESUME_PARSER_WORKERS = int(os.environ.get('RESUME_PARSER_WORKERS', min(4, os.cpu_count() or 1)))
+# Parses allowed to be queued or running at once; more are turned away instead of piling up
+RESUME_PARSER_QUEUE = int(os.environ.get('RESUME_PARSER_QUEUE', 2 * max(RESUME_PARSER_WORKERS, 1)))
+# Seconds a request waits for its parse before giving up
+RESUME_PARSE_TIMEOUT = float(os.environ.get('RESUME_PARSE_TIMEOUT', '30'))
+# Extraction budgets per resume: text is read page by page until one of them runs out
+RESUME_MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', '20'))
+RESUME_MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', '200000'))
+RESUME_MAX_SECONDS = float(os.environ.get('RESUME_MAX_SECONDS', '5'))
+# Hard limits on each worker process: address space it may grow by, and CPU seconds per parse
+RESUME_PARSER_MAX_MEMORY = int(os.environ.get('RESUME_PARSER_MAX_MEMORY', 512 << 20))
+RESUME_PARSER_MAX_CPU = int(os.environ.get('RESUME_PARSER_MAX_CPU', '10'))
+# Finished jobs whose result (or error) this process keeps for collecting
+FINISHED_JOBS = 1024
+# How often result() looks for a job finished by another process in the shared cache
+POLL_SECONDS = 0.05
+# Seconds a parse cut short by RESUME_MAX_SECONDS stays collectable by other processes; it isn't
+# cached for good, since running out of time depends on load rather than on the file
+PARTIAL_RESULT_SECONDS = 300
+# Seconds after which a job with no result is taken as lost with the process that ran it
+LOST_JOB_SECONDS = 300
+
+
+def read_bytes(file):
+    """The document's bytes from a path, bytes, or binary file object (read from the start)."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return f.read()
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return bytes(file)
+    file.seek(0)
+    return file.read()
+
+
+class ExtractionBudget:
+    """Limits on how much of one document is read; `exhausted` names the limit that stopped it."""
+
+    def __init__(self, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS, max_seconds=RESUME_MAX_SECONDS):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self.exhausted = None
+
+    def key(self):
+        """The limits that change what is extracted from the same bytes (wall time only truncates)."""
+        return f'pages={self.max_pages},chars={self.max_chars}'
+
+
+def iter_pages(data, budget, pdf_backend=None):
+    """Text of each page of a document, lazily, until the budget runs out.
+
+    Pages are only parsed when the consumer asks for them, so stopping early skips the
+    rest of the document. A page already being extracted runs to completion; the
+    parser pool's timeout covers a single pathological page.
+    """
+    pages = page_texts(data, pdf_backend)
+    deadline = time.monotonic() + budget.max_seconds
+    chars = 0
+    try:
+        for number in itertools.count():
+            if number >= budget.max_pages:
+                budget.exhausted = 'pages'
+                return
+            if time.monotonic() >= deadline:
+                budget.exhausted = 'seconds'
+                return
+            try:
+                text = next(pages, None)
+            except (ResourceLimitExceeded, MemoryError):
+                raise
+            except Exception as e:
+                # Raised by the document's parser while reading it, so it says something about the file
+                raise UnreadableDocument(f"{type(e).__name__}: {e}") from e
+            if text is None:
+                return
+            if chars + len(text) >= budget.max_chars:
+                budget.exhausted = 'chars'
+                yield text[:budget.max_chars - chars]
+                return
+            chars += len(text)
+            yield text
+    finally:
+        pages.close()
+
+
+def extract_skills(data, budget=None, pdf_backend=None):
+    """Counter of canonical taxonomy skill -> mentions in a resume, and the budget limit that cut it short (or None)."""
+    budget = budget or ExtractionBudget()
+    skills = Counter()
+    for text in iter_pages(data, budget, pdf_backend):
+        skills.update(skill_extractor.counts(text))
+    return skills, budget.exhausted
+
+
+class ResourceLimitExceeded(Exception):
+    """A parse ran out of worker memory or CPU time; the file is treated as hostile."""
+
+
+class UnreadableDocument(ValueError):
+    """The document's parser failed on it."""
+
+
+# Failures that are down to the file rather than to the server's configuration or state
+QUARANTINED_ERRORS = (RejectedDocument, UnsupportedDocument, UnreadableDocument, ResourceLimitExceeded)
+
+
+# CPU seconds allowed to the guarded parse a worker is running (0 between parses, so a
+# late SIGXCPU can't break the worker loop)
+_parse_cpu_limit = 0
+
+
+def _cpu_exceeded(signum, frame):
+    if _parse_cpu_limit:
+        raise ResourceLimitExceeded(f"Resume parse used more than {_parse_cpu_limit} s of CPU time")
+
+
+def _address_space():
+    # Bytes currently mapped by this process, or None where /proc isn't available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def limit_worker(max_memory=RESUME_PARSER_MAX_MEMORY):
+    """Process pool initializer: cap the worker's address space and turn SIGXCPU into an exception.
+
+    The cap is on top of what the forked worker already maps, so it bounds what one
+    parse can allocate rather than the size of the app it inherited.
+    """
+    signal.signal(signal.SIGXCPU, _cpu_exceeded)
+    mapped = _address_space()
+    if max_memory > 0 and mapped is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = mapped + max_memory
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def guarded_extract(data, max_cpu=RESUME_PARSER_MAX_CPU):
+    """extract_skills after the structural checks, with at most `max_cpu` CPU seconds (in a limit_worker process)."""
+    global _parse_cpu_limit
+    check_document(data)
+    if max_cpu <= 0:
+        return extract_skills(data)
+    # RLIMIT_CPU counts the process's whole life, so the limit is set relative to what it has used
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(usage.ru_utime + usage.ru_stime) + 1 + max_cpu
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    _parse_cpu_limit = max_cpu
+    try:
+        return extract_skills(data)
+    except MemoryError:
+        raise ResourceLimitExceeded("Resume parse ran out of worker memory")
+    finally:
+        _parse_cpu_limit = 0
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _warm():
+    # Runs once in each new worker so the first real parse doesn't pay for process start-up
+    return os.getpid()
+
+
+def _reusable(future):
+    # A failed job, or one cut short by its time budget, is retried when the file comes back
+    if not future.done():
+        return True
+    return not future.cancelled() and future.exception() is None and future.result()[1] != 'seconds'
+
+
+class ParserUnavailable(Exception):
+    """The parser can't take or finish this resume right now; the client should retry later."""
+
+
+class ParserBusy(ParserUnavailable):
+    pass
+
+
+class ParseTimeout(ParserUnavailable):
+    pass
+
+
+class ParseJobNotFound(LookupError):
+    """The job id is unknown here: never submitted, long finished, or handled by a process we share no cache with."""
+
+
+class QuarantinedDocument(RejectedDocument):
+    """The same file failed to parse before, so it is refused without parsing again."""
+
+
+class ResumeParserPool:
+    """Pre-started worker processes that run extract_skills off the web worker's GIL.
+
+    Parses run as jobs: submit() returns at once and result() waits for the skills.
+    At most `queue` parses are outstanding; submit() beyond that raises ParserBusy
+    rather than queueing. A parse that outlives `timeout` raises ParseTimeout in the
+    caller but keeps its slot until the worker really finishes, so a stuck document
+    makes the pool report busy instead of letting work pile up behind it.
+
+    Results are cached by content, so a file that was parsed before never reaches
+    the workers (and is never turned away as busy). Workers run under memory and
+    CPU limits, and a file that fails its structural checks, its limits or its parse
+    is quarantined by content key and refused on sight afterwards.
+    """
+
+    def __init__(self, workers=RESUME_PARSER_WORKERS, queue=RESUME_PARSER_QUEUE, timeout=RESUME_PARSE_TIMEOUT,
+                 cache=None, quarantine=None, max_memory=RESUME_PARSER_MAX_MEMORY):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.cache = cache or ParseCache(
+            f'{skill_extractor.fingerprint}:{ExtractionBudget().key()}:{RESUME_PDF_BACKEND}')
+        self.partial = ParseCache(f'{self.cache.fingerprint}:partial', entries=self.cache.entries,
+                                  directory=os.path.join(self.cache.directory, 'partial') if self.cache.directory else '',
+                                  max_bytes=self.cache.max_bytes // 8, max_age=PARTIAL_RESULT_SECONDS)
+        self.quarantine = quarantine if quarantine is not None else Quarantine(self.cache.fingerprint)
+        self._slots = threading.BoundedSemaphore(queue)
+        self._lock = threading.Lock()
+        self._executor = None
+        # Job id -> (future, executor) for jobs started by this process
+        self._jobs = OrderedDict()
+
+    def start(self):
+        """Start every worker now, before the server forks threads or takes traffic."""
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                # fork: workers inherit the imported modules instead of re-importing the app
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('fork'),
+                                                     initializer=limit_worker, initargs=(self.max_memory,))
+                for future in [self._executor.submit(_warm) for _ in range(self.workers)]:
+                    future.result()
+
+    def _restart(self, broken):
+        # A worker died (killed or crashed); the executor refuses new work until replaced
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                broken.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    def submit(self, file):
+        """Start parsing the resume at `file` (path, bytes or binary file object) and return its job id.
+
+        The job id is the content key, so the same file uploaded twice is one job, and
+        a job finished by another process can be collected from the shared cache.
+        Raises QuarantinedDocument for a file that failed before.
+        """
+        data = read_bytes(file)
+        key = content_key(data)
+        if key in self.quarantine:
+            raise QuarantinedDocument("This file could not be read before and was not parsed again")
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is not None and _reusable(job[0]):
+            return key
+        if self.cache.get(key) is not None:
+            return key
+        self._mark_started(key)
+        try:
+            job = self._start_job(data)
+        except BaseException:
+            self._mark_finished(key)
+            raise
+        job[0].add_done_callback(lambda future: self._finished(key, future))
+        with self._lock:
+            self._jobs[key] = job
+            # Finished jobs stay collectable for a while; after that the cache has their results
+            while len(self._jobs) > FINISHED_JOBS and next(iter(self._jobs.values()))[0].done():
+                self._jobs.popitem(last=False)
+        return key
+
+    def _start_job(self, data):
+        """(future of extract_skills, executor it runs on); raises ParserBusy when saturated."""
+        if self.workers <= 0:
+            future = Future()
+            try:
+                # No worker to confine, so only the structural checks apply
+                future.set_result(guarded_extract(data, max_cpu=0))
+            except Exception as e:
+                future.set_exception(e)
+            return future, None
+        if not self._slots.acquire(blocking=False):
+            raise ParserBusy("All resume parser workers are busy")
+        if self._executor is None:
+            self.start()
+        executor = self._executor
+        try:
+            future = executor.submit(guarded_extract, data)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._restart(executor)
+            raise ParserBusy("Resume parser workers are restarting")
+        future.add_done_callback(lambda _: self._slots.release())
+        return future, executor
+
+    def _finished(self, key, future):
+        try:
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                # Other errors (a dead worker, a missing backend) say nothing about this file
+                if isinstance(error, QUARANTINED_ERRORS):
+                    self.quarantine.add(key, f'{type(error).__name__}: {error}')
+                return
+            skills, exhausted = future.result()
+            # Running out of time depends on load, not on the file; let the next upload try again
+            if exhausted != 'seconds':
+                self.cache.put(key, skills)
+            else:
+                self.partial.put(key, skills)
+        finally:
+            # After the outcome is published, so a process that sees no marker finds the outcome
+            self._mark_finished(key)
+
+    # Jobs in progress are marked in the shared cache directory, so other processes can tell
+    # a job that is still running from one that was never started or was lost
+
+    def _marker(self, key):
+        return os.path.join(self.cache.directory, 'jobs', key)
+
+    def _mark_started(self, key):
+        if not self.cache.directory:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._marker(key)), exist_ok=True)
+            with open(self._marker(key), 'w'):
+                pass
+        except OSError as e:
+            print(f"Error marking resume parse job: {e}")
+
+    def _mark_finished(self, key):
+        if self.cache.directory:
+            try:
+                os.remove(self._marker(key))
+            except OSError:
+                pass
+
+    def _running_elsewhere(self, key):
+        """Whether another process marked the job as running within LOST_JOB_SECONDS."""
+        try:
+            return time.time() - os.path.getmtime(self._marker(key)) < LOST_JOB_SECONDS
+        except OSError:
+            return False
+
+    def _shared_result(self, key):
+        skills = self.cache.get(key, record=False)
+        return skills if skills is not None else self.partial.get(key, record=False)
+
+    def status(self, job_id):
+        """'running', 'done', 'failed', or None for a job this process doesn't know and hasn't cached."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            future = job[0]
+            if not future.done():
+                return 'running'
+            return 'failed' if future.cancelled() or future.exception() is not None else 'done'
+        running = self.cache.directory and self._running_elsewhere(job_id)
+        if self._shared_result(job_id) is not None:
+            return 'done'
+        if job_id in self.quarantine:
+            return 'failed'
+        return 'running' if running else None
+
+    def result(self, job_id, timeout=None):
+        """Skills found by a job, waiting up to `timeout` seconds (the pool's timeout by default) if it is running.
+
+        Raises ParseTimeout if it doesn't finish in time, ParseJobNotFound if no process
+        sharing the cache knows the job (or the one running it was lost), and the parse
+        error if parsing failed.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            future, executor = job
+            try:
+                return future.result(timeout)[0]
+            except TimeoutError:
+                raise ParseTimeout(f"Resume took longer than {self.timeout:g} s to parse")
+            except BrokenProcessPool:
+                self._restart(executor)
+                raise ParserBusy("A resume parser worker died; try again")
+        # Submitted to another process: its result lands in the shared cache directory,
+        # or its content key in the shared quarantine if parsing failed
+        deadline = time.monotonic() + timeout
+        while True:
+            # Checked before the outcome: a job's marker is removed only after its outcome is published
+            running = self.cache.directory and self._running_elsewhere(job_id)
+            skills = self._shared_result(job_id)
+            if skills is not None:
+                return skills
+            if job_id in self.quarantine:
+                raise QuarantinedDocument(f"Resume parse job {job_id} failed")
+            if not running:
+                raise ParseJobNotFound(f"No resume parse job {job_id}")
+            if time.monotonic() >= deadline:
+                raise ParseTimeout(f"Resume parse job {job_id} did not finish within {timeout:g} s")
+            time.sleep(POLL_SECONDS)
+
+    def parse(self, file):
+        """extract_skills for the resume at `file`, waiting for the result."""
+        return self.result(self.submit(file))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Shared by every request handled in this process
+resume_parser = ResumeParserPool()
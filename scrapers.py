@@ -0,0 +1,65 @@
+from urllib.parse import quote
+
+from bs4 import BeautifulSoup
+
+import http_client
+
+# Listings kept from one search results page
+MAX_LISTINGS = 10
+
+
+# Internships for a keyword query from Internshala; raises if the page can't be fetched
+def scrape_internships(query):
+    # Percent-encoded, so "C#" or "CI/CD" stay one keyword in one path segment
+    url = f"https://internshala.com/internships/keywords-{quote(query.replace(' ', '-'), safe='')}"
+    response = http_client.get(url)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    internships = []
+    listings = soup.find_all('div', class_='internship_meta')
+    for listing in listings[:MAX_LISTINGS]:
+        try:
+            title = listing.find('h3').get_text(strip=True)
+            company_tag = listing.find('a', class_='link_display_like_text')
+            company = company_tag.get_text(strip=True) if company_tag else "N/A"
+            link = "https://internshala.com" + listing.find('a')['href']
+            internships.append({'title': title, 'company': company, 'link': link})
+        except AttributeError:
+            continue
+    return internships
+
+
+# Jobs for a keyword query from LinkedIn's public search page; raises if the page can't be fetched
+def scrape_linkedin_jobs(query):
+    url = f"https://www.linkedin.com/jobs/search/?keywords={quote(query, safe='')}"
+    response = http_client.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    jobs = []
+    listings = soup.find_all('div', class_='result-card')
+    for listing in listings[:MAX_LISTINGS]:
+        try:
+            title = listing.find('h3', class_='result-card__title').get_text(strip=True)
+            company = listing.find('h4', class_='result-card__subtitle').get_text(strip=True)
+            link = listing.find('a', class_='result-card__full-card-link')['href']
+            jobs.append({'title': title, 'company': company, 'link': link})
+        except (AttributeError, TypeError):
+            continue
+    return jobs
+
+
+# Either scraper with failures logged and turned into an empty list, for pages that show what they can
+def fetch_internships(query):
+    try:
+        return scrape_internships(query)
+    except Exception as e:
+        print(f"Error fetching internships: {e}")
+        return []
+
+
+def fetch_linkedin_jobs(query):
+    try:
+        return scrape_linkedin_jobs(query)
+    except Exception as e:
+        print(f"Error fetching LinkedIn jobs: {e}")
+        return []
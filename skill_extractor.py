@@ -0,0 +1,117 @@
+import hashlib
+from collections import Counter, deque
+
+from skill_vocabulary import skill_vocabulary
+
+# Spellings this short ("R", "Go", "JS") only match as written in the taxonomy,
+# so ordinary words like "go" or a grade "c" in a resume aren't taken for skills
+EXACT_CASE_LENGTH = 2
+# Part of the fingerprint; bumped when counts() changes what it finds in the same text
+MATCHER_VERSION = 2
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillExtractor:
+    """Aho-Corasick automaton over every spelling of every taxonomy skill.
+
+    counts() reads the text once, whatever the number of spellings, and keeps a
+    match only at word boundaries: "Java" is not found inside "JavaScript", while
+    "C++" is found before a space even though "+" is not a word character.
+    Overlapping matches resolve to the leftmost, then longest, spelling.
+    """
+
+    def __init__(self, patterns):
+        # State 0 is the root; each state has transitions, a failure link and its matches
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self.patterns = 0
+        digest = hashlib.sha256(f'{MATCHER_VERSION}\n'.encode())
+        for spelling, skill in patterns:
+            text = ' '.join(spelling.split())
+            if not text:
+                continue
+            digest.update(f'{text}\0{skill}\n'.encode('utf-8'))
+            state = 0
+            for ch in text.lower():
+                following = self._goto[state].get(ch)
+                if following is None:
+                    following = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = following
+            match = (len(text), skill, text if len(text) <= EXACT_CASE_LENGTH else None)
+            if match not in self._out[state]:
+                self._out[state] += (match,)
+                self.patterns += 1
+        # Changes whenever the extractor could find different skills in the same text
+        self.fingerprint = digest.hexdigest()
+        self._link()
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, following in self._goto[state].items():
+                queue.append(following)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[following] = self._goto[fail].get(ch, 0)
+                # Breadth-first, so the failure state already carries its own suffix matches
+                self._out[following] += self._out[self._fail[following]]
+
+    @classmethod
+    def from_vocabulary(cls, vocabulary):
+        """Extractor for the canonical names and aliases in a SkillVocabulary's taxonomy."""
+        return cls((spelling, canonical)
+                   for canonical, aliases in vocabulary.taxonomy
+                   for spelling in [canonical, *aliases])
+
+    def counts(self, text):
+        """Counter of canonical skill -> number of mentions in text."""
+        text = ' '.join(text.split())
+        folded = text.lower()
+        # lower() changes the length of a few characters ("İ" becomes two); then fold one
+        # character at a time and map each folded position back to the character it came from
+        origin = None
+        if len(folded) != len(text):
+            pieces, origin = [], []
+            for index, ch in enumerate(text):
+                lowered = ch.lower()
+                pieces.append(lowered)
+                origin.extend([index] * len(lowered))
+            folded = ''.join(pieces)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for end, ch in enumerate(folded, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, skill, exact in out[state]:
+                start = end - length
+                if start and _is_word(folded[start - 1]) and _is_word(folded[start]):
+                    continue
+                if end < len(folded) and _is_word(folded[end]) and _is_word(folded[end - 1]):
+                    continue
+                if exact is not None:
+                    written = text[start:end] if origin is None else text[origin[start]:origin[end - 1] + 1]
+                    if written != exact:
+                        continue
+                found.append((start, -length, skill))
+        counts = Counter()
+        covered = 0
+        for start, negative_length, skill in sorted(found):
+            if start >= covered:
+                counts[skill] += 1
+                covered = start - negative_length
+        return counts
+
+
+# Built once per process from the skill taxonomy (and inherited by forked parser workers)
+skill_extractor = SkillExtractor.from_vocabulary(skill_vocabulary)
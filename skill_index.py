@@ -0,0 +1,91 @@
+import heapq
+
+import pandas as pd
+
+from skill_vocabulary import skill_vocabulary
+
+# Required_Skills is stored as "Python, SQL, Excel"
+SKILL_SEPARATOR = ', '
+
+
+def split_skills(required_skills):
+    """Tokenize a Required_Skills cell exactly the way the original row scan did."""
+    if not isinstance(required_skills, str):
+        return []
+    return required_skills.split(SKILL_SEPARATOR)
+
+
+class RowTitles:
+    """Titles of base rows followed by titles of rows added by deltas."""
+
+    def __init__(self, base, added):
+        self.base = base
+        self.added = added
+
+    def __len__(self):
+        return len(self.base) + len(self.added)
+
+    def __getitem__(self, row_id):
+        if row_id < len(self.base):
+            return self.base[row_id]
+        return self.added[row_id - len(self.base)]
+
+
+class SkillIndex:
+    """Inverted index from skill id to the ascending row ids of the jobs that require it.
+
+    An index with a delta applied keeps the base posting lists untouched and adds
+    small posting lists for the delta's rows plus the set of removed row ids.
+    """
+
+    def __init__(self, titles, postings, delta_postings=None, removed=frozenset()):
+        self.titles = titles
+        self.postings = postings
+        self.delta_postings = delta_postings or {}
+        self.removed = removed
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        postings = {}
+        for row_id, required in enumerate(jobs['Required_Skills'].tolist()):
+            for skill_id in skill_vocabulary.intern_all(split_skills(required)):
+                postings.setdefault(skill_id, []).append(row_id)
+        return cls(jobs['Job_Title'].tolist(), postings)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        if isinstance(snapshot.jobs, pd.DataFrame):
+            return cls.from_jobs(snapshot.jobs)
+        return snapshot.jobs.skill_index()  # Compiled catalogs map their arrays straight from disk
+
+    def with_delta(self, delta):
+        """This index with a CatalogDelta applied, in time proportional to the delta."""
+        postings = {}
+        for row_id, skills in zip(delta.row_ids(), delta.skill_lists):
+            for skill_id in skill_vocabulary.intern_all(skills):
+                postings.setdefault(skill_id, []).append(row_id)
+        return SkillIndex(RowTitles(self.titles, delta.titles), self.postings, postings, delta.removed)
+
+    def matching_rows(self, skills, limit=None):
+        """Row ids sharing at least one skill (names or ids), in file order, touching only those rows."""
+        wanted = skill_vocabulary.ids(skills)
+        lists = [self.postings[skill_id] for skill_id in wanted if skill_id in self.postings]
+        lists += [self.delta_postings[skill_id] for skill_id in wanted if skill_id in self.delta_postings]
+        if len(lists) == 1 and not self.removed:
+            return lists[0][:limit]
+        rows = []
+        last = -1
+        for row_id in heapq.merge(*lists):
+            if row_id != last and row_id not in self.removed:
+                rows.append(row_id)
+                last = row_id
+                if len(rows) == limit:
+                    break
+        return rows
+
+    def lookup(self, skills, limit=10):
+        return [self.titles[row_id] for row_id in self.matching_rows(skills, limit)]
+
+    def lookup_batch(self, skill_sets, limit=10):
+        # Each lookup already touches only matching postings; nothing to share between them
+        return [self.lookup(skills, limit) for skills in skill_sets]
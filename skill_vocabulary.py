@@ -0,0 +1,115 @@
+import os
+import threading
+
+# One skill per line: the canonical name, then its aliases, separated by '|'.
+# Ids are assigned in file order, so only ever append to the file.
+# The default ships with the code, so it is found whatever the working directory.
+SKILLS_TAXONOMY_PATH = os.environ.get('SKILLS_TAXONOMY_PATH',
+                                      os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.txt'))
+ALIAS_SEPARATOR = '|'
+
+
+def skill_key(name):
+    """Spelling-insensitive form of a skill name: case-folded, runs of whitespace collapsed."""
+    return ' '.join(name.split()).casefold()
+
+
+def read_taxonomy(path):
+    """[(canonical name, [aliases])] from a taxonomy file; a missing file is an empty taxonomy."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        if line.lstrip().startswith('#'):
+            continue  # Only whole-line comments: '#' is part of skills like C#
+        names = [name.strip() for name in line.split(ALIAS_SEPARATOR) if name.strip()]
+        if names:
+            entries.append((names[0], names[1:]))
+    return entries
+
+
+class SkillVocabulary:
+    """Dense integer ids for skills, with aliases and case variants folded onto one id.
+
+    Taxonomy skills get ids 0..n-1 in file order, so they mean the same skill in every
+    worker process and can be kept in the session. Other skills found in the catalog
+    are interned after those, in the order this process first sees them; their ids
+    are only meaningful inside the process.
+    """
+
+    def __init__(self, taxonomy=()):
+        # [(canonical name, [aliases])] as read from the taxonomy file
+        self.taxonomy = list(taxonomy)
+        self.names = []
+        # Exact spellings seen while interning and their skill_key() forms -> id
+        self._ids = {}
+        self._lock = threading.Lock()
+        for canonical, aliases in self.taxonomy:
+            skill_id = len(self.names)
+            self.names.append(canonical)
+            for name in [canonical, *aliases]:
+                existing = self._ids.setdefault(skill_key(name), skill_id)
+                if existing != skill_id:
+                    raise ValueError(f"Skill alias {name!r} is listed for both "
+                                     f"{self.names[existing]!r} and {canonical!r}")
+        self.taxonomy_size = len(self.names)
+
+    @classmethod
+    def load(cls, path=SKILLS_TAXONOMY_PATH):
+        return cls(read_taxonomy(path))
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        """Id of a catalog skill, assigning the next free id to a skill not seen before."""
+        skill_id = self._ids.get(name)
+        if skill_id is not None:
+            return skill_id
+        key = skill_key(name)
+        with self._lock:
+            skill_id = self._ids.get(key)
+            if skill_id is None:
+                skill_id = self._ids[key] = len(self.names)
+                self.names.append(name.strip())
+            self._ids[name] = skill_id
+        return skill_id
+
+    def intern_all(self, names):
+        """Distinct ids of a job's skills, in the order they are listed."""
+        return list(dict.fromkeys(self.intern(name) for name in names))
+
+    def id(self, skill):
+        """Id of a skill name or id from a request, or None if no catalog or taxonomy skill matches.
+
+        Unlike intern(), this never grows the vocabulary, so it is safe on user input.
+        """
+        if isinstance(skill, str):
+            skill_id = self._ids.get(skill)
+            return skill_id if skill_id is not None else self._ids.get(skill_key(skill))
+        if isinstance(skill, int) and 0 <= skill < len(self.names):
+            return skill
+        return None
+
+    def ids(self, skills):
+        """Set of known ids for skill names and/or ids; unknown skills can't match anything and are dropped."""
+        return {skill_id for skill_id in map(self.id, skills) if skill_id is not None}
+
+    def name(self, skill_id):
+        return self.names[skill_id]
+
+    def normalized(self, skill):
+        """Name that is the same in every process: canonical for taxonomy skills, skill_key() otherwise."""
+        skill_id = self.id(skill)
+        if skill_id is None:
+            return skill_key(skill) if isinstance(skill, str) else None
+        if skill_id < self.taxonomy_size:
+            return self.names[skill_id]
+        return skill_key(self.names[skill_id])
+
+
+# Shared by every catalog, index and request in this process
+skill_vocabulary = SkillVocabulary.load()
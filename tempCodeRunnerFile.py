@@ -2,9 +2,9 @@ from flask import Flask, request, render_template_string
 import os
 import PyPDF2
 import re
-import requests
 import pandas as pd
-from bs4 import BeautifulSoup
+
+from scrapers import fetch_internships, fetch_linkedin_jobs
 
 app = Flask(__name__)
 
@@ -18,57 +18,6 @@ def load_job_listings():
     df = pd.read_csv('./job_listings.csv')  # Adjust the path to your CSV file
     return df
 
-# Internship scraping from Internshala
-def fetch_internships(query):
-    """Fetch internships based on skills from Internshala."""
-    url = f"https://internshala.com/internships/keywords-{query.replace(' ', '-')}"
-    
-    try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        internships = []
-        listings = soup.find_all('div', class_='internship_meta')
-
-        for listing in listings[:10]:  # Limit to top 10 internships
-            try:
-                title = listing.find('h3').get_text(strip=True)
-                company_tag = listing.find('a', class_='link_display_like_text')
-                company = company_tag.get_text(strip=True) if company_tag else "N/A"
-                link = "https://internshala.com" + listing.find('a')['href']
-                internships.append({'title': title, 'company': company, 'link': link})
-            except AttributeError:
-                continue  # Skip any listings with missing data
-
-        return internships
-
-    except Exception:
-        return []
-
-# LinkedIn job scraping
-def fetch_linkedin_jobs(query):
-    """Fetch jobs based on skills from LinkedIn."""
-    url = f"https://www.linkedin.com/jobs/search/?keywords={query.replace(' ', '%20')}"
-    
-    try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-        soup = BeautifulSoup(response.content, 'html.parser')
-        jobs = []
-        listings = soup.find_all('div', class_='result-card')
-
-        for listing in listings[:10]:  # Limit to top 10 jobs
-            try:
-                title = listing.find('h3', class_='result-card__title').get_text(strip=True)
-                company = listing.find('h4', class_='result-card__subtitle').get_text(strip=True)
-                link = listing.find('a', class_='result-card__full-card-link')['href']
-                jobs.append({'title': title, 'company': company, 'link': link})
-            except AttributeError:
-                continue  # Skip incomplete listings
-
-        return jobs
-
-    except Exception:
-        return []
-
 # Extract skills from resume
 def parse_resume(file):
     """Extract skills from the uploaded resume."""
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+
+import pytest
+
+import compiled_catalog
+from catalog import MANIFEST, JobCatalog, delta_dir_for, live_frame
+from compiled_catalog import CompiledCatalog, compile_catalog
+from ranking import suggestion_engine
+
+BASE = '''Job_Title,Required_Skills,Company
+Data Analyst,"Python, SQL",Acme
+Web Developer,"JavaScript, HTML",Beta
+Support,,Gamma
+'''
+# 001 adds row 3 and removes base row 1; 002 removes row 3 again and adds row 4
+DELTAS = {
+    '001.csv': 'Job_Title,Required_Skills,Op,Location\n'
+               'ML Engineer,"Python, Machine Learning",,Remote\n'
+               'Web Developer,,remove,\n',
+    '002.csv': 'Job_Title,Required_Skills,Op\n'
+               'ML Engineer,,remove\n'
+               'DBA,SQL,\n',
+}
+LIVE = ['Data Analyst', 'Support', 'DBA']
+SKILL_SETS = [['SQL'], ['Python'], ['Python', 'SQL'], ['JavaScript'], ['Machine Learning'], []]
+
+
+def write(path, text):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write(text)
+
+
+def add_deltas(path, names=DELTAS):
+    delta_dir = delta_dir_for(path)
+    os.makedirs(delta_dir, exist_ok=True)
+    for name in names:
+        write(os.path.join(delta_dir, name), DELTAS[name])
+
+
+def delta_files(path):
+    return sorted(name for name in os.listdir(delta_dir_for(path)) if name.endswith('.csv'))
+
+
+def live_titles(catalog):
+    return live_frame(catalog.get())['Job_Title'].tolist()
+
+
+def lookups(catalog, mode):
+    engine = suggestion_engine(catalog.get(), mode)
+    return [engine.lookup(skills) for skills in SKILL_SETS]
+
+
+@pytest.fixture(params=['csv', 'jobcat', 'compiled csv'])
+def base(request, tmp_path, monkeypatch):
+    """(kind, catalog path) for a small CSV, a .jobcat, and a CSV large enough to be served from its compiled sibling."""
+    source = str(tmp_path / 'jobs.csv')
+    write(source, BASE)
+    if request.param == 'jobcat':
+        return request.param, compile_catalog(source, str(tmp_path / 'jobs.jobcat'))
+    if request.param == 'compiled csv':
+        monkeypatch.setattr(compiled_catalog, 'STREAM_THRESHOLD_BYTES', 0)
+    return request.param, source
+
+
+def test_deltas_apply_on_top_of_base(base):
+    _, path = base
+    add_deltas(path)
+    snapshot = JobCatalog(path).get()
+    assert list(snapshot.delta.row_ids()) == [3, 4]
+    assert snapshot.delta.removed == {1, 3}
+    assert len(snapshot) == 3
+    assert live_frame(snapshot)['Job_Title'].tolist() == LIVE
+    assert suggestion_engine(snapshot, 'filter').lookup(['SQL']) == ['Data Analyst', 'DBA']
+    assert suggestion_engine(snapshot, 'ranked').lookup(['JavaScript']) == []
+
+
+def test_new_delta_file_extends_the_current_base(base):
+    _, path = base
+    catalog = JobCatalog(path)
+    add_deltas(path, ['001.csv'])
+    first = catalog.get()
+    assert first.delta.removed == {1}
+    add_deltas(path, ['002.csv'])
+    second = catalog.get()
+    assert second.base is first.base
+    assert second.delta.removed == {1, 3}
+    assert live_titles(catalog) == LIVE
+
+
+def test_compact_folds_deltas_into_base(base):
+    _, path = base
+    add_deltas(path)
+    catalog = JobCatalog(path)
+    before = {mode: lookups(catalog, mode) for mode in ('filter', 'ranked')}
+    assert catalog.compact()
+    assert delta_files(path) == []
+    with open(os.path.join(delta_dir_for(path), MANIFEST)) as f:
+        assert json.load(f)['folded'] == ['001.csv', '002.csv']
+    assert catalog.get().delta is None
+    assert live_titles(catalog) == LIVE
+    fresh = JobCatalog(path)
+    assert fresh.get().delta is None
+    assert live_titles(fresh) == LIVE
+    for mode, results in before.items():
+        assert lookups(catalog, mode) == results
+        assert lookups(fresh, mode) == results
+    assert not catalog.compact()  # Nothing left to fold
+
+
+def test_compacted_csv_keeps_columns_and_spellings(base):
+    kind, path = base
+    if kind != 'csv':
+        pytest.skip('only a small CSV base is rewritten as CSV')
+    add_deltas(path)
+    assert JobCatalog(path).compact()
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ['Job_Title', 'Required_Skills', 'Company', 'Location'],
+        ['Data Analyst', 'Python, SQL', 'Acme', ''],
+        ['Support', '', 'Gamma', ''],
+        ['DBA', 'SQL', '', ''],
+    ]
+
+
+def test_compacted_compiled_base_keeps_skill_less_jobs(base, tmp_path):
+    kind, path = base
+    if kind == 'csv':
+        pytest.skip('a small CSV base is not compiled')
+    add_deltas(path)
+    catalog = JobCatalog(path)
+    catalog.get()
+    assert catalog.compact()
+    jobs = catalog.get().jobs
+    assert isinstance(jobs, CompiledCatalog)
+    assert '' not in jobs.skills.tolist()
+    rows = [(title, set(skills.split(', ')) if skills else skills) for title, skills in jobs.iter_rows()]
+    assert rows == [('Data Analyst', {'Python', 'SQL'}), ('Support', None), ('DBA', {'SQL'})]
+    assert suggestion_engine(catalog.get(), 'filter').lookup(['']) == []
+    if kind == 'compiled csv':
+        # The large CSV is left alone; its compiled sibling holds the folded jobs
+        with open(tmp_path / 'jobs.csv', encoding='utf-8') as f:
+            assert f.read() == BASE
+
+
+def test_manifest_keeps_folded_deltas_from_applying_twice(base):
+    _, path = base
+    add_deltas(path)
+    assert JobCatalog(path).compact()
+    # As if the compacting process died after swapping the base in but before deleting the deltas
+    add_deltas(path)
+    fresh = JobCatalog(path)
+    assert fresh.get().delta is None
+    assert live_titles(fresh) == LIVE
+
+
+def test_manifest_only_covers_the_base_it_names(base, tmp_path):
+    kind, path = base
+    if kind == 'compiled csv':
+        pytest.skip('replacing the CSV recompiles its sibling')
+    add_deltas(path)
+    assert JobCatalog(path).compact()
+    # A new base file: the manifest no longer describes it, so the same delta files apply to it
+    source = str(tmp_path / 'jobs.csv')
+    write(source, BASE + 'Tester,Excel,Delta\n')
+    if kind == 'jobcat':
+        compile_catalog(source, path)
+    add_deltas(path)
+    snapshot = JobCatalog(path).get()
+    assert snapshot.delta is not None
+    assert list(snapshot.delta.row_ids()) == [4, 5]
+    assert snapshot.delta.removed == {1, 4}
+    assert live_frame(snapshot)['Job_Title'].tolist() == ['Data Analyst', 'Support', 'Tester', 'DBA']
@@ -0,0 +1,43 @@
+import csv
+import os
+
+import pytest
+
+from benchmarks.synthetic import iter_job_rows, make_resumes, write_jobs_csv
+from catalog import JobCatalog, delta_dir_for
+from compiled_catalog import compile_catalog
+from ranking import SUGGESTION_ENGINES, suggestion_engine
+
+
+@pytest.fixture(params=['csv', 'jobcat'])
+def catalog(request, tmp_path):
+    path = str(tmp_path / 'jobs.csv')
+    write_jobs_csv(path, 500)
+    if request.param == 'jobcat':
+        path = compile_catalog(path, str(tmp_path / 'jobs.jobcat'))
+    return JobCatalog(path)
+
+
+def add_delta(catalog):
+    """New jobs plus tombstones for some base jobs and some of the new ones."""
+    os.makedirs(delta_dir_for(catalog.path), exist_ok=True)
+    added = list(iter_job_rows(600, seed=7))[500:]
+    removed = [title for title, _ in list(iter_job_rows(500))[::25]] + [added[3][0]]
+    with open(os.path.join(delta_dir_for(catalog.path), '001.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Job_Title', 'Required_Skills', 'Op'])
+        writer.writerows([title, skills, ''] for title, skills in added)
+        writer.writerows([title, '', 'remove'] for title in removed)
+
+
+@pytest.mark.parametrize('mode', sorted(SUGGESTION_ENGINES))
+@pytest.mark.parametrize('with_delta', [False, True])
+def test_batch_matches_single_lookups(catalog, mode, with_delta):
+    if with_delta:
+        add_delta(catalog)
+    snapshot = catalog.get()
+    assert (snapshot.delta is not None) == with_delta
+    engine = suggestion_engine(snapshot, mode)
+    skill_sets = make_resumes(200) + [[], ['Not A Skill'], ['Python', 'Python']]
+    for limit in (1, 10):
+        assert engine.lookup_batch(skill_sets, limit) == [engine.lookup(skills, limit) for skills in skill_sets]
@@ -0,0 +1,251 @@
+import codecs
+import hashlib
+import html
+import io
+import os
+import re
+import zipfile
+import zlib
+
+import PyPDF2
+
+from parse_cache import PageTextCache
+
+# Optional PDF backends: registered only when their package is installed
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+try:
+    from pdfminer.high_level import extract_pages as pdfminer_pages
+    from pdfminer.layout import LTTextContainer
+except ImportError:
+    pdfminer_pages = None
+
+PDF = 'application/pdf'
+DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+TEXT = 'text/plain'
+
+# Which registered PDF backend parses uploads; benchmarks/bench_text_extractors.py picks one
+RESUME_PDF_BACKEND = os.environ.get('RESUME_PDF_BACKEND', 'pypdf2')
+# Most bytes the raw scanner inflates from one content stream
+MAX_INFLATED_STREAM = 16 << 20
+
+# Page texts already extracted in this process (or, with a directory, by any worker)
+page_text_cache = PageTextCache('page-text-1')
+
+# MIME type -> {backend name: function(bytes) -> iterator of page texts}. Backends yield
+# lazily, so a caller that stops early never parses the remaining pages.
+EXTRACTORS = {}
+
+
+class UnsupportedDocument(ValueError):
+    pass
+
+
+def register(mime, name):
+    def decorator(function):
+        EXTRACTORS.setdefault(mime, {})[name] = function
+        return function
+    return decorator
+
+
+def detect_mime(data):
+    """MIME type of an upload from its leading bytes; the client's Content-Type and filename aren't trusted."""
+    if b'%PDF-' in data[:1024]:
+        return PDF
+    if data[:4] == b'PK\x03\x04':
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return DOCX
+        except zipfile.BadZipFile:
+            pass
+        raise UnsupportedDocument("Zip archive is not a DOCX document")
+    head = data[:8192]
+    if b'\0' not in head:
+        try:
+            # Not final: the sample may end in the middle of a multi-byte character
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            return TEXT
+        except UnicodeDecodeError:
+            pass
+    raise UnsupportedDocument("Resume must be a PDF, DOCX or plain text file")
+
+
+def backend_names(mime=PDF):
+    return list(EXTRACTORS.get(mime, ()))
+
+
+def page_texts(data, pdf_backend=None):
+    """Lazy iterator over the text of each page of a PDF, DOCX or plain text document."""
+    mime = detect_mime(data)
+    backends = EXTRACTORS[mime]
+    if mime == PDF:
+        name = pdf_backend or RESUME_PDF_BACKEND
+        if name not in backends:
+            raise ValueError(f"PDF backend {name!r} is not available; expected one of {sorted(backends)}")
+        return backends[name](data)
+    return next(iter(backends.values()))(data)
+
+
+def _object_digest(obj, memo):
+    """Stable hash of a PDF object and everything it references; streams count by their encoded bytes.
+
+    `memo` maps (object number, generation) to digests already taken in this document,
+    so shared fonts are hashed once and reference cycles terminate.
+    """
+    if hasattr(obj, 'idnum'):
+        ref = (obj.idnum, obj.generation)
+        if ref not in memo:
+            memo[ref] = f'R{obj.idnum}'  # Stands in for the object while it is being hashed
+            memo[ref] = _object_digest(obj.get_object(), memo)
+        return memo[ref]
+    if isinstance(obj, dict):
+        parts = [f'{key}={_object_digest(value, memo)}' for key, value in sorted(obj.items())]
+        data = getattr(obj, '_data', None)  # Stream objects keep their raw bytes here
+        if data is not None:
+            parts.append(hashlib.sha256(data).hexdigest())
+        text = '<<' + ' '.join(parts) + '>>'
+    elif isinstance(obj, list):
+        text = '[' + ' '.join(_object_digest(item, memo) for item in obj) + ']'
+    else:
+        return repr(obj)
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def _cached_pages(tag, reader):
+    """Text of each page of a PdfReader, extracting only pages page_text_cache hasn't seen.
+
+    A page is keyed by its content streams and resources (fonts, encodings, forms), which
+    is everything extract_text reads, so an edited resume re-extracts just its changed pages.
+    """
+    memo = {}
+    for page in reader.pages:
+        digest = hashlib.sha256(tag.encode())
+        for name in ('/Contents', '/Resources', '/Rotate'):
+            digest.update(f'\0{_object_digest(page.get(name), memo)}'.encode())
+        key = digest.hexdigest()
+        text = page_text_cache.get(key)
+        if text is None:
+            text = page.extract_text()
+            page_text_cache.put(key, text)
+        yield text
+
+
+@register(PDF, 'pypdf2')
+def _pypdf2_pages(data):
+    yield from _cached_pages(f'pypdf2-{PyPDF2.__version__}', PyPDF2.PdfReader(io.BytesIO(data)))
+
+
+if pypdf is not None:
+    @register(PDF, 'pypdf')
+    def _pypdf_pages(data):
+        yield from _cached_pages(f'pypdf-{pypdf.__version__}', pypdf.PdfReader(io.BytesIO(data)))
+
+
+if pdfminer_pages is not None:
+    @register(PDF, 'pdfminer')
+    def _pdfminer_pages(data):
+        for layout in pdfminer_pages(io.BytesIO(data)):
+            yield '\n'.join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+# Raw content-stream scanner: no object graph, fonts or layout, just the strings drawn
+# by text operators. Fast, but blind to hex-encoded CID fonts and to page order.
+_STREAM = re.compile(rb'(?<!end)stream\r?\n')
+_TEXT_TOKEN = re.compile(
+    rb'\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)'  # Literal string, one level of nested parentheses
+    rb'|<[0-9A-Fa-f\s]*>'                          # Hex string
+    rb'|-?\d*\.?\d+'                               # Number (kerning inside TJ arrays)
+    rb"|\[|\]|T\*|Tj|TJ|Td|TD|Tm|'|\"|BT|ET", re.S)
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_ESCAPE = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.S)
+
+
+def _unescape(literal):
+    def replace(match):
+        code = match.group(1)
+        if code[:1].isdigit():
+            return bytes([int(code, 8) & 0xFF])
+        if code in (b'\n', b'\r', b'\r\n'):
+            return b''  # Line continuation
+        return _ESCAPES.get(code, code)
+    return _ESCAPE.sub(replace, literal[1:-1])
+
+
+def _content_text(content):
+    lines = []
+    line = []
+    in_array = False
+    for match in _TEXT_TOKEN.finditer(content):
+        token = match.group()
+        if token[:1] == b'(':
+            line.append(_unescape(token).decode('latin-1'))
+        elif token[:1] == b'<':
+            digits = re.sub(rb'\s', b'', token[1:-1])
+            line.append(bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii')).decode('latin-1'))
+        elif token == b'[':
+            in_array = True
+        elif token == b']':
+            in_array = False
+        elif in_array:
+            if float(token) < -200:  # A wide negative kern is a word space
+                line.append(' ')
+        elif token in (b'T*', b'Td', b'TD', b'Tm', b"'", b'"', b'ET'):
+            if line:
+                lines.append(''.join(line))
+                line = []
+    if line:
+        lines.append(''.join(line))
+    return '\n'.join(lines)
+
+
+def _stream_text(dictionary, raw):
+    # Text drawn by one content stream, or None for a stream that draws none
+    if b'/FlateDecode' in dictionary:
+        try:
+            raw = zlib.decompressobj().decompress(raw, MAX_INFLATED_STREAM)
+        except zlib.error:
+            return None
+    elif b'/Filter' in dictionary:
+        return None  # Images and other encodings carry no text we can read
+    return _content_text(raw) if b'BT' in raw else None
+
+
+@register(PDF, 'raw')
+def _raw_pages(data):
+    """One 'page' per content stream that draws text, in file order."""
+    for match in _STREAM.finditer(data):
+        end = data.find(b'endstream', match.end())
+        if end < 0:
+            return
+        start = data.rfind(b'obj', 0, match.start())
+        dictionary = data[start:match.start()]
+        raw = data[match.end():end]
+        # Cached by the stream's own bytes; '\0' marks a stream known to draw no text
+        key = hashlib.sha256(b'raw\0%s\0%s' % (dictionary, raw)).hexdigest()
+        text = page_text_cache.get(key)
+        if text is None:
+            text = _stream_text(dictionary, raw)
+            page_text_cache.put(key, '\0' if text is None else text)
+        if text is not None and text != '\0':
+            yield text
+
+
+@register(DOCX, 'zipfile')
+def _docx_pages(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        document = archive.read('word/document.xml').decode('utf-8', errors='replace')
+    # Explicit page breaks split pages; paragraphs and tabs become whitespace
+    for page in re.split(r'<w:br [^>]*w:type="page"[^>]*/>', document):
+        text = re.sub(r'</w:p>|<w:br[^>]*/>', '\n', page)
+        text = re.sub(r'<w:tab/>', '\t', text)
+        yield html.unescape(re.sub(r'<[^>]+>', '', text))
+
+
+@register(TEXT, 'utf-8')
+def _text_pages(data):
+    # Form feeds separate pages in text exported from PDFs
+    for page in data.decode('utf-8', errors='replace').split('\f'):
+        yield page